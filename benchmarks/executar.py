@@ -0,0 +1,244 @@
+# Arquivo: benchmarks/executar.py
+# Benchmarks da limpeza: micro (cada padronizar_*) e ponta a ponta (linhas/s e pico de memória), salvos em JSON.
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows: sem ru_maxrss, o pico de memória fica em branco
+    resource = None
+
+from benchmarks.gerador import gerar_leads, gravar_csv, indice_sintetico
+from src.logic.analise_icp import CuboICP
+from src.logic.data_cleaning import (
+    aplicar_por_valores_unicos,
+    padronizar_nome_contato,
+    padronizar_nomes_contato,
+    padronizar_nome_empresa,
+    padronizar_nomes_empresa,
+    padronizar_localidade_geral,
+    padronizar_cidade,
+    padronizar_site,
+    padronizar_sites,
+    padronizar_telefone,
+    padronizar_telefones,
+    padronizar_segmento,
+    padronizar_numero_funcionarios
+)
+from src.logic.pipeline import MAPA_COLUNAS, TAMANHO_BLOCO_PADRAO, limpar_arquivo, limpar_csv
+from src.logic.selecao import selecionar_um_por_empresa
+
+DIRETORIO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resultados')
+TAMANHOS_PADRAO = [10_000, 100_000, 1_000_000]
+LINHAS_MICRO_PADRAO = 100_000
+
+def _pico_memoria_mb():
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes.
+    return pico / 1_000_000 if sys.platform == 'darwin' else pico / 1_000
+
+def _melhor_tempo(func, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+def _casos_micro(df, indice):
+    """(nome, função escalar, colunas de entrada) para cada padronizar_*."""
+    mapa_cidades, mapa_estados = indice.mapa_cidades, indice.mapa_estados
+    estado = lambda x: padronizar_localidade_geral(x, 'estado', mapa_cidades, mapa_estados)
+    pais = lambda x: padronizar_localidade_geral(x, 'pais', mapa_cidades, mapa_estados)
+    cidade = lambda x, uf: padronizar_cidade(x, uf, indice)
+    return [
+        ('padronizar_nome_empresa', padronizar_nome_empresa, [df['Nome_Empresa']]),
+        ('padronizar_site', padronizar_site, [df['Site_Original']]),
+        ('padronizar_telefone', padronizar_telefone, [df['Telefone_Original']]),
+        ('padronizar_segmento', padronizar_segmento, [df['Segmento_Original']]),
+        ('padronizar_numero_funcionarios', padronizar_numero_funcionarios, [df['Numero_Funcionarios']]),
+        ('padronizar_localidade_geral:estado', estado, [df['Estado_Contato']]),
+        ('padronizar_localidade_geral:pais', pais, [df['Pais_Contato']]),
+        ('padronizar_cidade', cidade, [df['Cidade_Contato'], df['Estado_Contato']]),
+    ]
+
+def executar_micro(linhas, repeticoes, semente):
+    """Mede cada função célula a célula e na versão por coluna usada pelo pipeline."""
+    df = gerar_leads(linhas, semente).rename(columns=MAPA_COLUNAS)
+    indice = indice_sintetico()
+    resultados = []
+
+    def registrar(funcao, modo, segundos):
+        resultados.append({'funcao': funcao, 'modo': modo, 'linhas': linhas, 'segundos': segundos,
+                           'linhas_por_segundo': linhas / segundos if segundos else None})
+
+    colunas_nome = ['Nome_Lead', 'Sobrenome_Lead']
+    registrar('padronizar_nome_contato', 'linha_a_linha', _melhor_tempo(
+        lambda: df[colunas_nome].apply(lambda row: padronizar_nome_contato(row, colunas_nome), axis=1), repeticoes))
+    registrar('padronizar_nomes_contato', 'vetorizado', _melhor_tempo(
+        lambda: padronizar_nomes_contato(df[colunas_nome]), repeticoes))
+
+    for nome, func, colunas in _casos_micro(df, indice):
+        valores = [c.tolist() for c in colunas]
+        registrar(nome, 'escalar', _melhor_tempo(lambda: [func(*v) for v in zip(*valores)], repeticoes))
+        registrar(nome, 'valores_unicos', _melhor_tempo(lambda: aplicar_por_valores_unicos(func, *colunas), repeticoes))
+
+    registrar('padronizar_nomes_empresa', 'vetorizado', _melhor_tempo(
+        lambda: padronizar_nomes_empresa(df['Nome_Empresa']), repeticoes))
+    registrar('padronizar_sites', 'vetorizado', _melhor_tempo(lambda: padronizar_sites(df['Site_Original']), repeticoes))
+    registrar('padronizar_telefones', 'vetorizado', _melhor_tempo(
+        lambda: padronizar_telefones(df['Telefone_Original']), repeticoes))
+    registrar('selecionar_um_por_empresa', 'vetorizado', _melhor_tempo(
+        lambda: selecionar_um_por_empresa(df), repeticoes))
+    registrar('CuboICP', 'montagem', _melhor_tempo(lambda: CuboICP(df), repeticoes))
+    cubo = CuboICP(df)
+    filtros = {'estado': list(cubo.valores['estado'][:5]), 'nivel_cargo': ['Gerente', 'Coordenador']}
+    registrar('CuboICP.contar', 'consulta', _melhor_tempo(lambda: cubo.contar(**filtros), repeticoes))
+    registrar('CuboICP.contar_por', 'consulta', _melhor_tempo(lambda: cubo.contar_por('segmento', **filtros),
+                                                              repeticoes))
+    return resultados
+
+def _medir_ponta_a_ponta(caminho, cenario, tamanho_bloco):
+    # Roda num processo novo: o pico de memória (ru_maxrss) é só desta execução.
+    indice = indice_sintetico()
+    memoria_base = _pico_memoria_mb()
+    inicio = time.perf_counter()
+    if cenario == 'limpar_arquivo':
+        linhas = len(limpar_arquivo(caminho, indice))
+    else:
+        with tempfile.TemporaryDirectory() as diretorio:
+            linhas = limpar_csv(caminho, os.path.join(diretorio, 'limpo.csv'), indice, tamanho_bloco)
+    segundos = time.perf_counter() - inicio
+    return {'linhas': linhas, 'segundos': segundos, 'memoria_base_mb': memoria_base,
+            'pico_memoria_mb': _pico_memoria_mb()}
+
+def executar_ponta_a_ponta(tamanhos, repeticoes, semente, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """Gera um CSV por tamanho e mede `limpar_arquivo` (tudo em memória) e `limpar_csv` (em blocos)."""
+    contexto = multiprocessing.get_context('spawn')
+    resultados = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        for tamanho in tamanhos:
+            caminho = gravar_csv(tamanho, os.path.join(diretorio, f'leads_{tamanho}.csv'), semente)
+            tamanho_arquivo = os.path.getsize(caminho)
+            for cenario in ('limpar_arquivo', 'limpar_csv'):
+                medicoes = []
+                for _ in range(repeticoes):
+                    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+                        medicoes.append(executor.submit(_medir_ponta_a_ponta, caminho, cenario, tamanho_bloco).result())
+                melhor = min(medicoes, key=lambda m: m['segundos'])
+                picos = [m['pico_memoria_mb'] for m in medicoes if m['pico_memoria_mb'] is not None]
+                resultados.append({
+                    'cenario': cenario, 'linhas': tamanho, 'bytes_entrada': tamanho_arquivo,
+                    'tamanho_bloco': tamanho_bloco if cenario == 'limpar_csv' else None,
+                    'segundos': melhor['segundos'],
+                    'linhas_por_segundo': tamanho / melhor['segundos'] if melhor['segundos'] else None,
+                    'memoria_base_mb': melhor['memoria_base_mb'],
+                    'pico_memoria_mb': max(picos) if picos else None,
+                })
+                print(f"  {cenario:<14} {tamanho:>9} linhas: {melhor['segundos']:.2f}s "
+                      f"({resultados[-1]['linhas_por_segundo']:,.0f} linhas/s), "
+                      f"pico {resultados[-1]['pico_memoria_mb'] or 0:.0f} MB")
+    return resultados
+
+def _commit_atual():
+    try:
+        saida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=10,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+        return saida.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def _versao_pacote(nome):
+    try:
+        return __import__(nome).__version__
+    except ImportError:
+        return None
+
+def ambiente():
+    return {
+        'data': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit_atual(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'nucleos': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'pyarrow': _versao_pacote('pyarrow'),
+    }
+
+def _chave(resultado):
+    if 'funcao' in resultado:
+        return ('micro', resultado['funcao'], resultado['modo'], resultado['linhas'])
+    return ('ponta_a_ponta', resultado['cenario'], resultado['linhas'])
+
+def comparar(atual, base):
+    """Imprime a variação de tempo (e de memória) de cada medição em relação a um resultado anterior."""
+    anteriores = {_chave(r): r for r in base['micro'] + base['ponta_a_ponta']}
+    print(f"Comparação com {base['ambiente'].get('commit')} ({base['ambiente'].get('data')}):")
+    for resultado in atual['micro'] + atual['ponta_a_ponta']:
+        anterior = anteriores.get(_chave(resultado))
+        if anterior is None or not anterior['segundos']:
+            continue
+        razao = resultado['segundos'] / anterior['segundos']
+        linha = f"  {' '.join(str(p) for p in _chave(resultado)[1:]):<60} {anterior['segundos']:>9.3f}s -> " \
+                f"{resultado['segundos']:>9.3f}s ({razao:.2f}x)"
+        if resultado.get('pico_memoria_mb') and anterior.get('pico_memoria_mb'):
+            linha += f", pico {anterior['pico_memoria_mb']:.0f} -> {resultado['pico_memoria_mb']:.0f} MB"
+        print(linha)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks da limpeza de leads com dados sintéticos do Apollo.")
+    parser.add_argument('--tamanhos', type=int, nargs='*', default=TAMANHOS_PADRAO,
+                        help="Linhas dos arquivos do benchmark ponta a ponta (padrão: 10000 100000 1000000; vazio pula).")
+    parser.add_argument('--linhas-micro', type=int, default=LINHAS_MICRO_PADRAO,
+                        help=f"Linhas usadas nos micro-benchmarks (padrão: {LINHAS_MICRO_PADRAO}; 0 pula).")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Execuções por medição; vale a melhor (padrão: 3).")
+    parser.add_argument('--semente', type=int, default=42, help="Semente do gerador (padrão: 42).")
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO_PADRAO,
+                        help=f"Linhas por bloco no cenário limpar_csv (padrão: {TAMANHO_BLOCO_PADRAO}).")
+    parser.add_argument('--saida', help="Arquivo JSON de resultado (padrão: benchmarks/resultados/<data>_<commit>.json).")
+    parser.add_argument('--comparar', metavar='BASE_JSON', help="Resultado anterior para comparar com esta execução.")
+    args = parser.parse_args(argv)
+
+    resultado = {'ambiente': ambiente(), 'semente': args.semente, 'micro': [], 'ponta_a_ponta': []}
+    if args.linhas_micro:
+        print(f"Micro-benchmarks ({args.linhas_micro} linhas)...")
+        resultado['micro'] = executar_micro(args.linhas_micro, args.repeticoes, args.semente)
+        for r in resultado['micro']:
+            print(f"  {r['funcao']:<40} {r['modo']:<15} {r['segundos']:.3f}s ({r['linhas_por_segundo']:,.0f} linhas/s)")
+    if args.tamanhos:
+        print("Ponta a ponta...")
+        resultado['ponta_a_ponta'] = executar_ponta_a_ponta(
+            args.tamanhos, args.repeticoes, args.semente, args.tamanho_bloco)
+
+    saida = args.saida
+    if not saida:
+        carimbo = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        saida = os.path.join(DIRETORIO_RESULTADOS, f"{carimbo}_{resultado['ambiente']['commit'] or 'sem-commit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultado salvo em {os.path.abspath(saida)}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            comparar(resultado, json.load(arquivo))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# Arquivo: benchmarks/gerador.py
+# Gerador determinístico (por semente) de exportações no estilo Apollo, com a sujeira que a Estação 1 precisa limpar.
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from dados_traducao import DICIONARIO_SEGMENTOS
+from src.logic.ibge import montar_indice
+
+PRIMEIROS_NOMES = [
+    'Ana', 'João', 'Maria', 'José', 'Pedro', 'Lucas', 'Juliana', 'Fernanda', 'Carlos', 'Paulo',
+    'Mariana', 'Rafael', 'Bruna', 'Gabriel', 'Letícia', 'Thiago', 'Camila', 'André', 'Beatriz', 'Luís',
+    'Ana Clara', 'João Pedro', 'Maria Eduarda', 'Conceição', 'Márcio'
+]
+SOBRENOMES = [
+    'Silva', 'da Silva', 'Souza', 'de Souza', 'Oliveira Santos', 'dos Santos', 'Pereira', 'Costa',
+    'de Oliveira Lima', 'Rodrigues', 'Almeida', 'Nascimento', 'da Costa e Silva', 'Araújo', 'Gonçalves',
+    'Fernandes da Rocha', 'das Neves', 'Carvalho', 'Ribeiro', 'do Carmo'
+]
+CARGOS = [
+    'Gerente de Compras', 'Gerente Comercial', 'Coordenador de TI', 'Coordenadora de Marketing', 'CEO',
+    'Diretor Comercial', 'Diretora de Operações', 'Analista de Sistemas', 'Head of Sales', 'Sales Manager',
+    'Supervisor de Vendas', 'Sócio', 'Founder', 'IT Manager', 'Especialista em Suprimentos', 'Estagiário'
+]
+EMPRESAS = [
+    'Acme', 'Tech Solutions', 'Comércio de Peças Paulista', 'Grupo Horizonte', 'Logística Brasil',
+    'Alimentos do Vale', 'Construtora Aliança', 'Farmácia Popular do Norte', 'Nuvem Digital', 'Agro Forte',
+    'Indústria Metalúrgica Sul', 'Consultoria Prisma', 'Transportes Rápidos', 'Editora Saber', 'Clínica Vida'
+]
+SUFIXOS_EMPRESA = ['', '', ' LTDA', ' Ltda.', ' S.A.', ' S/A', ' SA', ' EIRELI', ' ME', ' EPP', ' MEI', ' ltda']
+# (cidade oficial, UF)
+CIDADES = [
+    ('São Paulo', 'SP'), ('Campinas', 'SP'), ('Ribeirão Preto', 'SP'), ('São José dos Campos', 'SP'),
+    ('Rio de Janeiro', 'RJ'), ('Niterói', 'RJ'), ('Belo Horizonte', 'MG'), ('Uberlândia', 'MG'),
+    ('Curitiba', 'PR'), ('Londrina', 'PR'), ('Porto Alegre', 'RS'), ('Caxias do Sul', 'RS'),
+    ('Florianópolis', 'SC'), ('Joinville', 'SC'), ('Salvador', 'BA'), ('Recife', 'PE'), ('Fortaleza', 'CE'),
+    ('Brasília', 'DF'), ('Goiânia', 'GO'), ('Manaus', 'AM'), ('Belém', 'PA'), ('Vitória', 'ES'),
+    ('São Luís', 'MA'), ('Natal', 'RN'), ('João Pessoa', 'PB'), ('Maceió', 'AL'), ('Cuiabá', 'MT'),
+    ('Campo Grande', 'MS'), ('Bom Jesus', 'PI'), ('Bom Jesus', 'RS')
+]
+NOMES_UF = {
+    'SP': 'São Paulo', 'RJ': 'Rio de Janeiro', 'MG': 'Minas Gerais', 'PR': 'Paraná', 'RS': 'Rio Grande do Sul',
+    'SC': 'Santa Catarina', 'BA': 'Bahia', 'PE': 'Pernambuco', 'CE': 'Ceará', 'DF': 'Distrito Federal',
+    'GO': 'Goiás', 'AM': 'Amazonas', 'PA': 'Pará', 'ES': 'Espírito Santo', 'MA': 'Maranhão',
+    'RN': 'Rio Grande do Norte', 'PB': 'Paraíba', 'AL': 'Alagoas', 'MT': 'Mato Grosso', 'MS': 'Mato Grosso do Sul',
+    'PI': 'Piauí'
+}
+PAISES = ['Brazil', 'Brazil', 'Brazil', 'BR', 'Brasil', 'brazil', 'United States', 'Portugal']
+SEGMENTOS_DESCONHECIDOS = ['Renewables & Environment', 'Wellness & Fitness Services', 'Space Tourism']
+DDDS = ['11', '19', '16', '12', '21', '31', '34', '41', '43', '51', '54', '48', '47', '71', '81', '85', '61',
+        '62', '92', '91', '27', '98', '84', '83', '82', '65', '67', '89']
+
+def _sem_acentos(texto):
+    return ''.join(c for c in unicodedata.normalize('NFD', texto) if unicodedata.category(c) != 'Mn')
+
+def _variantes_texto(texto):
+    """Grafias que aparecem nas exportações: original, sem acento, minúsculas e maiúsculas."""
+    return [texto, texto, _sem_acentos(texto), texto.lower(), _sem_acentos(texto).lower(), texto.upper()]
+
+def _escolher(rng, valores, n, prob_nulo=0.0):
+    valores = np.asarray(valores, dtype=object)
+    escolhidos = valores[rng.integers(0, len(valores), n)]
+    if prob_nulo:
+        escolhidos[rng.random(n) < prob_nulo] = np.nan
+    return escolhidos
+
+def _telefones(rng, n):
+    ddd = _escolher(rng, DDDS, n)
+    celular = rng.integers(0, 2, n).astype(bool)
+    assinante = pd.Series(rng.integers(0, 10 ** 8, n)).astype(str).str.zfill(8).to_numpy(dtype=object)
+    numero = np.where(celular, '9' + assinante, pd.Series(rng.integers(2, 6, n)).astype(str).to_numpy(dtype=object)
+                      + pd.Series(assinante).str[1:].to_numpy(dtype=object))
+    numero = pd.Series(numero, dtype=object)
+    ddd = pd.Series(ddd, dtype=object)
+    prefixo, sufixo = numero.str[:-4], numero.str[-4:]
+    formatos = [
+        '+55 ' + ddd + ' ' + prefixo + '-' + sufixo,
+        '(' + ddd + ') ' + prefixo + '-' + sufixo,
+        '0' + ddd + numero,
+        ddd + numero,
+        '+55' + ddd + numero,
+        pd.Series(['0800 ' + str(i % 1000).zfill(3) + ' 4567' for i in range(n)], dtype=object),
+        '+1 415 555 ' + sufixo,
+        '20 ' + prefixo + '-' + sufixo,  # DDD inexistente
+    ]
+    pesos = np.array([30, 25, 10, 10, 10, 5, 5, 5], dtype=float)
+    tipo = rng.choice(len(formatos), n, p=pesos / pesos.sum())
+    resultado = np.empty(n, dtype=object)
+    for i, serie in enumerate(formatos):
+        mascara = tipo == i
+        resultado[mascara] = serie.to_numpy(dtype=object)[mascara]
+    resultado[rng.random(n) < 0.08] = np.nan
+    return resultado
+
+def gerar_leads(n, semente=42):
+    """Gera `n` leads com as colunas de uma exportação do Apollo. A mesma semente produz sempre o mesmo arquivo."""
+    rng = np.random.default_rng(semente)
+    primeiro = _escolher(rng, [v for nome in PRIMEIROS_NOMES for v in _variantes_texto(nome)] + ['  Ana  '], n, 0.02)
+    sobrenome = _escolher(rng, [v for nome in SOBRENOMES for v in _variantes_texto(nome)], n, 0.05)
+
+    base_empresa = _escolher(rng, EMPRESAS, n)
+    numero_empresa = rng.integers(0, max(n // 20, 50), n)
+    empresa = (pd.Series(base_empresa) + ' ' + pd.Series(numero_empresa).astype(str)
+               + pd.Series(_escolher(rng, SUFIXOS_EMPRESA, n)))
+    empresa = empresa.where(rng.integers(0, 4, n) > 0, empresa.str.upper()).to_numpy(dtype=object)
+    empresa[rng.random(n) < 0.01] = np.nan
+
+    dominio = (pd.Series(base_empresa).map(_sem_acentos).str.lower().str.replace(' ', '', regex=False)
+               + pd.Series(numero_empresa).astype(str) + pd.Series(_escolher(rng, ['.com.br', '.com', '.io'], n)))
+    site = (pd.Series(_escolher(rng, ['', 'www.', 'http://', 'https://www.', 'http://www.'], n)) + dominio
+            + pd.Series(_escolher(rng, ['', '', '/', '/contato'], n))).to_numpy(dtype=object)
+    site[rng.random(n) < 0.05] = np.nan
+    usuario = (pd.Series(primeiro).fillna('contato').map(_sem_acentos).str.strip().str.lower()
+               .str.replace(' ', '.', regex=False) + pd.Series(rng.integers(0, 1000, n)).astype(str))
+    email = (usuario + '@' + dominio.str.replace(r'^www\.', '', regex=True)).to_numpy(dtype=object)
+    email[rng.random(n) < 0.03] = np.nan
+
+    segmentos = [s for chave in DICIONARIO_SEGMENTOS for s in (chave, chave.title(), chave.replace(' and ', ' & '))]
+    segmento = _escolher(rng, segmentos + SEGMENTOS_DESCONHECIDOS, n, 0.04)
+
+    def localidades(prob_nulo):
+        variantes = [(v, uf) for cidade, uf in CIDADES for v in _variantes_texto(cidade)]
+        escolha = rng.integers(0, len(variantes), n)
+        cidade = np.array([variantes[i][0] for i in range(len(variantes))], dtype=object)[escolha]
+        uf = np.array([variantes[i][1] for i in range(len(variantes))], dtype=object)[escolha]
+        grafia_estado = rng.integers(0, 5, n)
+        nome_uf = pd.Series(uf).map(NOMES_UF)
+        estado = np.select(
+            [grafia_estado == 0, grafia_estado == 1, grafia_estado == 2, grafia_estado == 3],
+            [uf, nome_uf, 'State of ' + nome_uf.map(_sem_acentos), nome_uf.str.lower()],
+            'Federal District'
+        ).astype(object)
+        estado = np.where((grafia_estado == 4) & (uf != 'DF'), uf, estado)
+        cidade[rng.random(n) < prob_nulo] = np.nan
+        estado[rng.random(n) < prob_nulo] = np.nan
+        return cidade, estado
+
+    cidade_contato, estado_contato = localidades(0.06)
+    cidade_empresa, estado_empresa = localidades(0.03)
+    funcionarios = pd.Series(rng.choice([5, 12, 30, 50, 85, 150, 320, 900, 2500, 12000], n)).astype(str)
+    funcionarios = funcionarios.where(rng.integers(0, 3, n) > 0, funcionarios + '.0').to_numpy(dtype=object)
+    funcionarios[rng.random(n) < 0.05] = np.nan
+
+    slug = pd.Series(usuario).str.replace('.', '-', regex=False)
+    return pd.DataFrame({
+        'First Name': primeiro,
+        'Last Name': sobrenome,
+        'Title': _escolher(rng, CARGOS, n, 0.03),
+        'Company': empresa,
+        'Email': email,
+        'Corporate Phone': _telefones(rng, n),
+        'Industry': segmento,
+        'City': cidade_contato,
+        'State': estado_contato,
+        'Country': _escolher(rng, PAISES, n, 0.05),
+        'Company City': cidade_empresa,
+        'Company State': estado_empresa,
+        'Company Country': _escolher(rng, PAISES, n, 0.02),
+        'Website': site,
+        '# Employees': funcionarios,
+        'Person Linkedin Url': ('http://www.linkedin.com/in/' + slug).to_numpy(dtype=object),
+        'Company Linkedin Url': ('http://www.linkedin.com/company/' + dominio.str.split('.').str[0]).to_numpy(dtype=object),
+        'Facebook Url': np.where(rng.random(n) < 0.3, 'https://facebook.com/' + dominio.str.split('.').str[0], np.nan),
+        'Seniority': _escolher(rng, ['manager', 'director', 'c_suite', 'entry'], n),
+    })
+
+def gravar_csv(n, caminho, semente=42):
+    gerar_leads(n, semente).to_csv(caminho, index=False)
+    return caminho
+
+def indice_sintetico():
+    """Índice de localidades com as cidades do gerador: o benchmark exercita as buscas mesmo sem snapshot do IBGE."""
+    return montar_indice([(i, cidade, uf) for i, (cidade, uf) in enumerate(CIDADES)], 'benchmark', 'sintetico')
@@ -0,0 +1,68 @@
+# Arquivo: pages/2_Analise_de_ICP.py
+import time
+
+import pandas as pd
+import streamlit as st
+
+from src.logic.analise_icp import CuboICP
+
+ROTULOS_DIMENSOES = {
+    'segmento': 'Segmentos',
+    'nivel_cargo': 'Níveis de cargo',
+    'cargo': 'Cargos',
+    'estado': 'Estados (empresa)',
+    'porte': 'Porte (funcionários)',
+}
+
+def obter_cubo(df, chave):
+    """Monta o cubo uma vez por conjunto de dados; mudar os filtros não recalcula nada sobre as linhas."""
+    if st.session_state.get('id_cubo_icp') != chave:
+        st.session_state['cubo_icp'] = CuboICP(df)
+        st.session_state['id_cubo_icp'] = chave
+    return st.session_state['cubo_icp']
+
+# --- INTERFACE DA ESTAÇÃO 2 ---
+
+st.set_page_config(layout="wide", page_title="Estação 2: Análise de ICP")
+st.title("📊 Estação 2: Análise de ICP")
+st.write("Defina o Perfil de Cliente Ideal e veja quantos leads e empresas únicos estão disponíveis.")
+
+df, chave_dados = None, None
+if 'df_limpo' in st.session_state:
+    df, chave_dados = st.session_state['df_limpo'], st.session_state['id_limpeza']
+    st.caption(f"Analisando o último arquivo limpo na Estação 1 ({len(df)} linhas).")
+else:
+    arquivo_limpo = st.file_uploader("Carregue um arquivo já limpo pela Estação 1 (.csv)", type="csv")
+    if arquivo_limpo is not None:
+        df = pd.read_csv(arquivo_limpo, sep=';', dtype=str, keep_default_na=False, encoding='utf-8-sig')
+        chave_dados = arquivo_limpo.file_id
+    else:
+        st.info("Limpe um arquivo na Estação 1 ou carregue aqui um arquivo já limpo para começar.")
+
+if df is not None:
+    with st.spinner('Preparando a análise...'):
+        cubo = obter_cubo(df, chave_dados)
+
+    colunas_filtro = st.columns(len(ROTULOS_DIMENSOES))
+    filtros = {}
+    for coluna, (dimensao, rotulo) in zip(colunas_filtro, ROTULOS_DIMENSOES.items()):
+        with coluna:
+            filtros[dimensao] = st.multiselect(rotulo, cubo.valores[dimensao], placeholder="Todos")
+
+    inicio = time.perf_counter()
+    resultado = cubo.contar(**filtros)
+    segundos = time.perf_counter() - inicio
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Leads únicos", f"{resultado.leads:,}".replace(',', '.'))
+    col2.metric("Empresas únicas", f"{resultado.empresas:,}".replace(',', '.'))
+    col3.metric("Linhas no arquivo", f"{resultado.linhas:,}".replace(',', '.'))
+    st.caption(f"Contagem feita em {segundos * 1000:.1f} ms sobre {len(cubo)} combinações distintas do arquivo.")
+
+    st.write("---")
+    st.header("Análise de Mercado")
+    dimensao = st.radio("Detalhar por", [d for d in ROTULOS_DIMENSOES if d != 'cargo'],
+                        format_func=ROTULOS_DIMENSOES.get, horizontal=True)
+    detalhe = cubo.contar_por(dimensao, **filtros)
+    st.bar_chart(detalhe[['leads', 'empresas']].head(15))
+    st.dataframe(detalhe)
@@ -1,60 +1,33 @@
 # Arquivo: pages/1_Limpeza.py (Versão Corrigida)
+import os
+import uuid
+
 import streamlit as st
-import pandas as pd
-import requests
-import io
-
-# --- Importa as funções de lógica do nosso novo arquivo ---
-from src.logic.data_cleaning import (
-    normalizar_texto_para_comparacao,
-    padronizar_nome_contato,
-    padronizar_nome_empresa,
-    padronizar_localidade_geral,
-    padronizar_site,
-    padronizar_telefone,
-    padronizar_segmento, 
-    padronizar_numero_funcionarios 
-)
-
-@st.cache_data
+
+# --- Importa a lógica de limpeza (independente do Streamlit) ---
+from src.logic.cache_resultados import CacheResultados
+from src.logic.data_cleaning import CacheLRU
+from src.logic.exportacao import FORMATOS_EXPORTACAO, exportar_em_cache, formatos_disponiveis, remover_exportacoes
+from src.logic.ibge import carregar_indice_ibge
+from src.logic.ingestao import RelatorioIngestao
+from src.logic.instrumentacao import MODOS_PERFIL, Instrumentacao, configurar_logs, perfilar
+from src.logic.memoria_leads import CHAVES_PADRAO, DeduplicacaoMemoria, MemoriaLeads
+from src.logic.pipeline import compactar_dataframe, limpar_arquivo, relatorio_memoria, remover_leads_conhecidos
+from src.logic.selecao import COLUNA_MOTIVO, selecionar_um_por_empresa
+from src.logic.similaridade import LIMIAR_PADRAO, RelatorioCorrecoes
+
+# As métricas de cada limpeza saem como logs JSON no terminal do servidor (nível em LOG_LEVEL; padrão INFO).
+configurar_logs()
+
+@st.cache_resource
 def carregar_dados_ibge():
-    """Carrega e prepara mapas otimizados de cidades e estados da API do IBGE."""
-    try:
-        url_municipios = "https://servicodados.ibge.gov.br/api/v1/localidades/municipios"
-        response_municipios = requests.get(url_municipios)
-        response_municipios.raise_for_status()
-        municipios_json = response_municipios.json()
-        mapa_cidades = {
-            normalizar_texto_para_comparacao(m['nome']): m['nome']
-            for m in municipios_json if 'nome' in m
-        }
-        mapa_estados = {}
-        for m in municipios_json:
-            try:
-                uf_data = m['microrregiao']['mesorregiao']['UF']
-                sigla = uf_data['sigla'].lower()
-                nome = uf_data['nome']
-                mapa_estados[sigla] = nome
-                mapa_estados[normalizar_texto_para_comparacao(nome)] = nome
-            except (KeyError, TypeError):
-                continue
-        return mapa_cidades, mapa_estados
-    except Exception as e:
-        st.error(f"Não foi possível carregar a lista de localidades do IBGE: {e}")
-        return {}, {}
-
-def ler_csv_flexivel(arquivo_upado):
-    try:
-        arquivo_upado.seek(0)
-        df = pd.read_csv(arquivo_upado, sep=',', encoding='utf-8', on_bad_lines='skip', low_memory=False)
-        if df.shape[1] <= 1:
-            arquivo_upado.seek(0)
-            df = pd.read_csv(arquivo_upado, sep=';', encoding='utf-8', on_bad_lines='skip', low_memory=False)
-        df.columns = df.columns.str.strip()
-        return df
-    except Exception as e:
-        st.error(f"Erro crítico ao ler o arquivo CSV: {e}")
-        return None
+    """Carrega o índice de cidades e estados do IBGE (snapshot local, com a API como atualização opcional)."""
+    return carregar_indice_ibge()
+
+@st.cache_resource
+def obter_cache_transformacoes():
+    """Cache LRU de transformações compartilhado por todas as sessões do servidor."""
+    return CacheLRU()
 
 # --- INTERFACE DA ESTAÇÃO 1 ---
 
@@ -63,72 +36,152 @@ st.title("⚙️ Estação 1: Limpeza e Preparação de Dados")
 st.write("Faça o upload do seu arquivo de leads (exportado do Apollo ou similar) para limpá-lo e padronizá-lo.")
 
 # Carrega os dados do IBGE e os mantém em cache
-MAPA_CIDADES, MAPA_ESTADOS = carregar_dados_ibge()
+INDICE_IBGE = carregar_dados_ibge()
+if INDICE_IBGE.origem == 'embutido':
+    st.warning("Lista de municípios do IBGE indisponível (sem snapshot local e sem acesso à API). Apenas estados serão padronizados.")
+
+@st.cache_resource
+def obter_cache_resultados():
+    """Resultados de limpeza já calculados, em disco: sobrevivem a reruns e a reinícios do servidor."""
+    return CacheResultados()
+
+@st.cache_resource
+def obter_memoria_leads():
+    """Memória de leads já processados, compartilhada por todas as sessões do servidor."""
+    return MemoriaLeads()
+
+CACHE_TRANSFORMACOES = obter_cache_transformacoes()
+CACHE_RESULTADOS = obter_cache_resultados()
 
 uploaded_file = st.file_uploader("1. Selecione o arquivo de DADOS brutos (.csv)", type="csv")
 
+with st.expander("Opções avançadas"):
+    trabalhadores = st.number_input(
+        "Processos paralelos (1 = sem paralelismo)", min_value=1, max_value=os.cpu_count() or 1, value=1,
+        help="Divide o arquivo em blocos e limpa vários ao mesmo tempo. Útil para arquivos muito grandes."
+    )
+    corrigir_aproximado = st.checkbox(
+        "Corrigir erros de digitação em cidades e segmentos",
+        help="Valores fora da lista do IBGE ou do dicionário de segmentos são trocados pelo mais parecido."
+    )
+    limiar_similaridade = st.slider(
+        "Confiança mínima para corrigir", min_value=0.70, max_value=0.99, value=LIMIAR_PADRAO, step=0.01,
+        disabled=not corrigir_aproximado
+    )
+    um_por_empresa = st.checkbox(
+        "Manter só um contato por empresa",
+        help="Escolhe, em cada empresa (nome + site), o contato de cargo mais prioritário: Gerente > Coordenador > "
+             "Diretor > Supervisor > Especialista > Analista. A coluna Motivo_Selecao explica cada escolha."
+    )
+    usar_memoria = st.checkbox(
+        "Remover leads já processados em arquivos anteriores",
+        help="Consulta a memória de leads e descarta quem já apareceu antes (ou se repete neste arquivo)."
+    )
+    rotulos_chaves = {'email': 'E-mail', 'telefone': 'Telefone', 'dominio': 'Domínio da empresa'}
+    chaves_memoria = st.multiselect(
+        "Considerar repetido quando coincidir", list(rotulos_chaves), default=list(CHAVES_PADRAO),
+        format_func=rotulos_chaves.get, disabled=not usar_memoria,
+        help="Com o domínio, só um contato por empresa passa a ser aceito em todos os arquivos."
+    )
+    registrar_na_memoria = st.checkbox(
+        "Guardar os leads novos deste arquivo na memória", value=True, disabled=not usar_memoria
+    )
+    modo_perfil = st.selectbox(
+        "Perfilamento desta execução", [None, *MODOS_PERFIL],
+        format_func=lambda m: {None: 'Desligado', 'cprofile': 'cProfile', 'pyinstrument': 'pyinstrument'}[m],
+        help="Registra onde o tempo é gasto dentro de cada função. Deixa a limpeza mais lenta; use só para investigar."
+    )
+
 if st.button("🧹 Iniciar Limpeza e Padronização"):
     if uploaded_file is not None:
         with st.spinner('Lendo e processando o arquivo... Por favor, aguarde.'):
-            df = ler_csv_flexivel(uploaded_file)
-            
-            if df is not None:
-                mapa_colunas = {
-                    'First Name': 'Nome_Lead', 'Last Name': 'Sobrenome_Lead', 'Title': 'Cargo', 
-                    'Company': 'Nome_Empresa', 'Email': 'Email_Lead', 'Corporate Phone': 'Telefone_Original',
-                    'Industry': 'Segmento_Original', 'City': 'Cidade_Contato', 'State': 'Estado_Contato', 
-                    'Country': 'Pais_Contato', 'Company City': 'Cidade_Empresa', 'Company State': 'Estado_Empresa',
-                    'Company Country': 'Pais_Empresa', 'Website': 'Site_Original', '# Employees': 'Numero_Funcionarios',
-                    'Person Linkedin Url': 'Linkedin_Contato', 'Company Linkedin Url': 'LinkedIn_Empresa', 
-                    'Facebook Url': 'Facebook_Empresa'
-                }
-                
-                colunas_para_renomear = {k: v for k, v in mapa_colunas.items() if k in df.columns}
-                df_limpo = df.rename(columns=colunas_para_renomear)
-                
-                colunas_finais = list(colunas_para_renomear.values())
-                df_limpo = df_limpo[[col for col in colunas_finais if col in df_limpo.columns]].copy()
-
-                df_cols = list(df_limpo.columns)
-                if 'Nome_Lead' in df_cols and 'Sobrenome_Lead' in df_cols:
-                    df_limpo['Nome_Completo'] = df_limpo.apply(lambda row: padronizar_nome_contato(row, df_cols), axis=1)
-                    df_limpo = df_limpo.drop(columns=['Nome_Lead', 'Sobrenome_Lead'])
-                
-                colunas_para_padronizar = {
-                    'Nome_Empresa': padronizar_nome_empresa, 
-                    'Site_Original': padronizar_site,
-                    'Telefone_Original': padronizar_telefone,
-                    'Segmento_Original': padronizar_segmento, 
-                    'Numero_Funcionarios': padronizar_numero_funcionarios,
-                    'Cidade_Contato': lambda x: padronizar_localidade_geral(x, 'cidade', MAPA_CIDADES, MAPA_ESTADOS),
-                    'Estado_Contato': lambda x: padronizar_localidade_geral(x, 'estado', MAPA_CIDADES, MAPA_ESTADOS),
-                    'Pais_Contato': lambda x: padronizar_localidade_geral(x, 'pais', MAPA_CIDADES, MAPA_ESTADOS),
-                    'Cidade_Empresa': lambda x: padronizar_localidade_geral(x, 'cidade', MAPA_CIDADES, MAPA_ESTADOS),
-                    'Estado_Empresa': lambda x: padronizar_localidade_geral(x, 'estado', MAPA_CIDADES, MAPA_ESTADOS),
-                    'Pais_Empresa': lambda x: padronizar_localidade_geral(x, 'pais', MAPA_CIDADES, MAPA_ESTADOS),
-                }
-                
-                for col, func in colunas_para_padronizar.items():
-                    if col in df_limpo.columns:
-                        df_limpo[col] = df_limpo[col].astype(str).apply(func)
-                
-                ordem_final_desejada = [
-                    'Nome_Completo', 'Cargo', 'Email_Lead', 'Nome_Empresa', 'Site_Original',
-                    'Telefone_Original', 'Cidade_Contato', 'Estado_Contato', 'Pais_Contato',
-                    'Segmento_Original', 'Cidade_Empresa', 'Estado_Empresa', 'Pais_Empresa',
-                    'Numero_Funcionarios', 'Linkedin_Contato', 'LinkedIn_Empresa', 'Facebook_Empresa'
-                ]
-                colunas_existentes_na_ordem = [col for col in ordem_final_desejada if col in df_limpo.columns]
-                outras_colunas = [col for col in df_limpo.columns if col not in colunas_existentes_na_ordem]
-                df_limpo = df_limpo[colunas_existentes_na_ordem + outras_colunas]
-                
-                df_limpo.fillna('', inplace=True)
-                for col in df_limpo.columns:
-                    df_limpo[col] = df_limpo[col].astype(str).apply(lambda x: '' if x.strip().lower() == 'nan' else x)
-                    
+            relatorio_ingestao = RelatorioIngestao()
+            instrumentacao = Instrumentacao()
+            correcoes = RelatorioCorrecoes()
+            deduplicacao = None
+            if usar_memoria and chaves_memoria:
+                # Com um contato por empresa, só os escolhidos são guardados (depois da seleção).
+                deduplicacao = DeduplicacaoMemoria(obter_memoria_leads(), tuple(chaves_memoria), uploaded_file.name,
+                                                   registrar_na_memoria and not um_por_empresa)
+            perfil, memoria, resultado = None, None, None
+            try:
+                with instrumentacao.etapa('ibge'):
+                    indice = carregar_dados_ibge()
+                limiar = limiar_similaridade if corrigir_aproximado else None
+                # A deduplicação depende do estado da memória de leads: fica fora da chave e roda sempre depois.
+                chave_resultado = CACHE_RESULTADOS.chave(uploaded_file, indice, limiar_similaridade=limiar)
+                if modo_perfil is None:
+                    with instrumentacao.etapa('cache_resultados'):
+                        resultado = CACHE_RESULTADOS.buscar(chave_resultado)
+                if resultado is not None:
+                    df_limpo, relatorio_ingestao, correcoes = resultado
+                else:
+                    with perfilar(modo_perfil) as perfil:
+                        df_expandido = limpar_arquivo(
+                            uploaded_file, indice, cache=CACHE_TRANSFORMACOES, trabalhadores=trabalhadores,
+                            relatorio=relatorio_ingestao, compactar=False, instrumentacao=instrumentacao,
+                            limiar_similaridade=limiar, correcoes=correcoes
+                        )
+                        # Só a versão compacta fica na sessão; a expandida serve apenas para o relatório de memória.
+                        with instrumentacao.etapa('compactacao', len(df_expandido)):
+                            df_limpo = compactar_dataframe(df_expandido)
+                    memoria = relatorio_memoria(df_expandido, df_limpo)
+                    del df_expandido
+                    with instrumentacao.etapa('cache_resultados', len(df_limpo)):
+                        CACHE_RESULTADOS.guardar(chave_resultado, (df_limpo, relatorio_ingestao, correcoes))
+                df_limpo = remover_leads_conhecidos(df_limpo, deduplicacao, instrumentacao)
+                if um_por_empresa:
+                    with instrumentacao.etapa('selecao', len(df_limpo)) as medicao:
+                        total_antes_selecao = len(df_limpo)
+                        df_limpo = selecionar_um_por_empresa(df_limpo)
+                        medicao.linhas_saida = len(df_limpo)
+                    if deduplicacao is not None and registrar_na_memoria:
+                        deduplicacao.guardar(df_limpo)
+                instrumentacao.emitir_logs(arquivo=uploaded_file.name, trabalhadores=trabalhadores)
+            except Exception as e:
+                st.error(f"Erro crítico ao ler o arquivo CSV: {e}")
+                df_limpo = None
+
+            if df_limpo is not None:
                 st.success("Arquivo limpo e padronizado com sucesso!")
+                if relatorio_ingestao.linhas_descartadas:
+                    st.warning(f"{relatorio_ingestao.linhas_descartadas} linhas malformadas foram ignoradas na leitura.")
+                if resultado is not None:
+                    st.caption("Resultado reaproveitado de uma limpeza anterior deste mesmo arquivo.")
+                st.caption(f"Leitura: {relatorio_ingestao.resumo()}")
+                if deduplicacao is not None:
+                    st.info(f"Memória de leads: {deduplicacao.resumo()}.")
+                if um_por_empresa:
+                    st.info(f"Um contato por empresa: {len(df_limpo)} escolhidos de {total_antes_selecao} leads.")
+                    with st.expander("Por que cada contato foi escolhido"):
+                        st.dataframe(df_limpo[COLUNA_MOTIVO].value_counts().rename('contatos'))
+                if trabalhadores == 1 and resultado is None:
+                    estatisticas = CACHE_TRANSFORMACOES.estatisticas()
+                    st.caption(
+                        f"Cache de transformações: {estatisticas['taxa_acerto']:.0%} de acertos, "
+                        f"{estatisticas['reaproveitamento']:.0%} das células resolvidas sem recalcular."
+                    )
                 st.dataframe(df_limpo.head(10))
+                if corrigir_aproximado:
+                    with st.expander(f"Correções automáticas: {len(correcoes)} valores distintos corrigidos"):
+                        st.dataframe(correcoes.tabela())
+                if memoria is not None:
+                    with st.expander(f"Memória desta sessão: {memoria.loc['Total', 'depois_mb']:.1f} MB "
+                                     f"(antes: {memoria.loc['Total', 'antes_mb']:.1f} MB)"):
+                        st.dataframe(memoria.round(2))
+                etapas = instrumentacao.tabela()
+                with st.expander(f"Tempo por etapa: {etapas['segundos'].sum():.2f}s no total"):
+                    if trabalhadores > 1:
+                        st.caption("Com processos paralelos, o tempo das etapas de limpeza é a soma entre os processos.")
+                    st.dataframe(etapas.round(3))
+                if perfil is not None:
+                    with st.expander(f"Perfil da execução ({perfil.modo})"):
+                        st.code(perfil.texto)
 
+                # Cada resultado ganha um id próprio: os arquivos de download gerados para o anterior são descartados.
+                if 'id_limpeza' in st.session_state:
+                    remover_exportacoes(st.session_state['id_limpeza'])
+                st.session_state['id_limpeza'] = uuid.uuid4().hex
                 st.session_state['df_limpo'] = df_limpo
     else:
         st.warning("Por favor, faça o upload de um arquivo para começar.")
@@ -139,10 +192,21 @@ if 'df_limpo' in st.session_state:
     col1, col2 = st.columns(2)
     
     with col1:
-        csv = st.session_state['df_limpo'].to_csv(sep=';', index=False, encoding='utf-8-sig').encode('utf-8-sig')
+        formato = st.selectbox(
+            "Formato do arquivo", formatos_disponiveis(),
+            format_func=lambda f: {'csv': 'CSV (;)', 'parquet': 'Parquet', 'arrow': 'Arrow IPC'}[f]
+        )
+        extensao, mime = FORMATOS_EXPORTACAO[formato]
+        df_para_exportar, id_limpeza = st.session_state['df_limpo'], st.session_state['id_limpeza']
+
+        def gerar_download():
+            # Só roda quando o botão é clicado; o arquivo gerado é reaproveitado nos cliques seguintes.
+            with open(exportar_em_cache(df_para_exportar, formato, id_limpeza), 'rb') as arquivo:
+                return arquivo.read()
+
         st.download_button(
-            label="⬇️ Baixar CSV Limpo", data=csv, file_name='leads_limpos.csv', 
-            mime='text/csv', use_container_width=True
+            label="⬇️ Baixar Leads Limpos", data=gerar_download, file_name=f'leads_limpos{extensao}',
+            mime=mime, use_container_width=True
         )
         
     with col2:
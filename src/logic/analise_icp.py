@@ -0,0 +1,183 @@
+# Arquivo: src/logic/analise_icp.py
+# Cubo pré-agregado para contar leads e empresas únicos por ICP (segmento x cargo x estado x porte).
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.logic.memoria_leads import chaves_dos_leads
+from src.logic.selecao import carregar_prioridades, chaves_empresa
+
+SEM_INFORMACAO = 'Não informado'
+OUTROS_CARGOS = 'Outros'
+# (mínimo, máximo) de funcionários por faixa de porte; None = sem limite superior.
+FAIXAS_FUNCIONARIOS = ((1, 10), (11, 50), (51, 200), (201, 500), (501, 1000), (1001, 5000), (5001, None))
+# Faixas como as exportadas pelo Apollo ("51-200", "10,001+", "1.001-5.000"): contam pelo limite inferior.
+_NUMERO_FAIXA = r'\d{1,3}(?:[.,]\d{3})+|\d+'
+REGEX_FAIXA_FUNCIONARIOS = rf'^\s*({_NUMERO_FAIXA})\s*(?:[-–]\s*(?:{_NUMERO_FAIXA})|\+)\s*$'
+
+# Dimensão do cubo -> coluna limpa de origem.
+DIMENSOES = {
+    'segmento': 'Segmento_Original',
+    'nivel_cargo': 'Cargo',
+    'cargo': 'Cargo',
+    'estado': 'Estado_Empresa',
+    'porte': 'Numero_Funcionarios',
+}
+
+@dataclass
+class ResultadoICP:
+    leads: int
+    empresas: int
+    linhas: int
+
+def rotulo_faixa(minimo, maximo):
+    return f'{minimo}+' if maximo is None else f'{minimo}-{maximo}'
+
+def _numeros_funcionarios(valores):
+    # Número de funcionários de cada valor; uma faixa ("51-200", "10,001+") vale pelo seu limite inferior.
+    valores = pd.Series(valores, dtype=object)
+    numeros = pd.to_numeric(valores, errors='coerce')
+    texto = valores.where(numeros.isna() & valores.map(lambda v: isinstance(v, str)))
+    minimos = texto.str.extract(REGEX_FAIXA_FUNCIONARIOS, expand=False).str.replace('[.,]', '', regex=True)
+    return numeros.fillna(pd.to_numeric(minimos, errors='coerce')).to_numpy(dtype=float)
+
+def faixas_porte(numero_funcionarios):
+    """Faixa de porte (ex.: '51-200') de cada valor de Numero_Funcionarios; SEM_INFORMACAO se vazio ou inválido.
+
+    Valores que já são faixas (ex.: '51-200', '10,001+') entram na faixa do seu limite inferior.
+    """
+    # Cada valor distinto é convertido uma vez.
+    codigos, unicos = pd.factorize(pd.Series(numero_funcionarios).astype(object))
+    numeros = np.append(_numeros_funcionarios(unicos), np.nan)[codigos]
+    limites = [minimo - 0.5 for minimo, _ in FAIXAS_FUNCIONARIOS] + [np.inf]
+    rotulos = [rotulo_faixa(*faixa) for faixa in FAIXAS_FUNCIONARIOS]
+    faixas = pd.cut(numeros, limites, labels=rotulos)
+    return pd.Categorical(faixas.add_categories(SEM_INFORMACAO).fillna(SEM_INFORMACAO),
+                          categories=[*rotulos, SEM_INFORMACAO])
+
+def niveis_cargo(cargos, prioridades=None):
+    """Nível de prioridade de cada cargo (Gerente, Coordenador...), ou OUTROS_CARGOS fora da lista."""
+    prioridades = prioridades or carregar_prioridades()
+    cargos = pd.Series(cargos).astype(object)
+    codigos, unicos = pd.factorize(cargos)
+    rotulos = np.array([*prioridades.rotulos, OUTROS_CARGOS], dtype=object)
+    niveis = np.append(rotulos[[prioridades.prioridade(c) for c in unicos]], OUTROS_CARGOS)[codigos]
+    return pd.Categorical(niveis, categories=list(rotulos))
+
+def _texto_com_ausentes(serie):
+    texto = serie.astype(object).where(serie.notna(), '').astype(str).str.strip()
+    valores = texto.where(texto != '', SEM_INFORMACAO)
+    categorias = sorted(set(valores.unique()) - {SEM_INFORMACAO})
+    return pd.Categorical(valores, categories=[*categorias, SEM_INFORMACAO])
+
+def _ids_leads(df):
+    # Um lead é identificado pelo e-mail; sem e-mail, pelo telefone; sem os dois, cada linha é um lead.
+    chaves = chaves_dos_leads(df)
+    email, telefone = chaves['email'], chaves['telefone']
+    por_telefone = ('t:' + telefone.fillna('')).where(telefone.notna(), None)
+    ids, _ = pd.factorize(('e:' + email.fillna('')).where(email.notna(), por_telefone))
+    return _completar_ids(ids)
+
+def _completar_ids(ids):
+    sem_id = ids < 0
+    ids[sem_id] = ids.max(initial=-1) + 1 + np.arange(sem_id.sum())
+    return ids
+
+def _pares_por_celula(celulas, ids):
+    # Pares (célula, id) distintos, ordenados por célula: a base das contagens de únicos.
+    total_ids = int(ids.max(initial=-1)) + 1
+    base = max(total_ids, 1)
+    pares = np.unique(celulas.astype(np.int64) * base + ids)
+    return pares // base, pares % base, total_ids
+
+def _contar_distintos(ids, total):
+    marcados = np.zeros(total, dtype=bool)
+    marcados[ids] = True
+    return int(np.count_nonzero(marcados))
+
+class CuboICP:
+    """Cubo das combinações de segmento, cargo, estado e porte presentes no arquivo, montado uma vez.
+
+    Cada célula ocupada guarda quantas linhas tem e quais leads e empresas aparecem nela. Uma consulta marca as
+    células que passam nos filtros (uma comparação por célula, não por linha) e conta os leads e empresas
+    distintos dessas células.
+    """
+
+    def __init__(self, df, prioridades=None):
+        prioridades = prioridades or carregar_prioridades()
+        vazia = pd.Series('', index=df.index, dtype=object)
+        coluna = lambda dimensao: df[DIMENSOES[dimensao]] if DIMENSOES[dimensao] in df else vazia
+        categorias = {
+            'segmento': _texto_com_ausentes(coluna('segmento')),
+            'nivel_cargo': niveis_cargo(coluna('nivel_cargo'), prioridades),
+            'cargo': _texto_com_ausentes(coluna('cargo')),
+            'estado': _texto_com_ausentes(coluna('estado')),
+            'porte': faixas_porte(coluna('porte')),
+        }
+        self.valores = {dimensao: tuple(c.categories) for dimensao, c in categorias.items()}
+        codigos = [np.asarray(c.codes, dtype=np.int64) for c in categorias.values()]
+        tamanhos = [len(v) for v in self.valores.values()]
+
+        # Só as células ocupadas (no máximo uma por linha), com o código de cada dimensão.
+        celula_por_linha, celulas = pd.factorize(np.ravel_multi_index(codigos, tamanhos))
+        self._codigos_celula = dict(zip(self.valores, np.unravel_index(celulas, tamanhos)))
+        self._linhas_celula = np.bincount(celula_por_linha, minlength=len(celulas))
+        self._celula_lead, self._lead, self.total_leads = _pares_por_celula(celula_por_linha, _ids_leads(df))
+        self._celula_empresa, self._empresa, self.total_empresas = _pares_por_celula(
+            celula_por_linha, _completar_ids(chaves_empresa(df)))
+        self.total_linhas = len(df)
+        self._indices_dimensao = {}
+
+    def __len__(self):
+        return len(self._linhas_celula)
+
+    def _celulas_selecionadas(self, filtros):
+        selecionadas = np.ones(len(self), dtype=bool)
+        for dimensao, escolhidos in filtros.items():
+            if dimensao not in self.valores:
+                raise ValueError(f"Dimensão desconhecida: {dimensao}; use {', '.join(self.valores)}.")
+            if not escolhidos:
+                continue
+            permitidos = np.isin(np.array(self.valores[dimensao], dtype=object), list(escolhidos))
+            selecionadas &= permitidos[self._codigos_celula[dimensao]]
+        return selecionadas
+
+    def contar(self, **filtros):
+        """Leads, empresas e linhas que atendem aos filtros (dimensão=lista de valores; vazio = todos)."""
+        selecionadas = self._celulas_selecionadas(filtros)
+        return ResultadoICP(
+            leads=_contar_distintos(self._lead[selecionadas[self._celula_lead]], self.total_leads),
+            empresas=_contar_distintos(self._empresa[selecionadas[self._celula_empresa]], self.total_empresas),
+            linhas=int(self._linhas_celula[selecionadas].sum()),
+        )
+
+    def _indice_dimensao(self, dimensao):
+        # Pares (célula, id) ordenados por (valor da dimensão, id), com o início de cada grupo (valor, id).
+        # Montado na primeira consulta por `dimensao` e reaproveitado nas seguintes.
+        if dimensao not in self._indices_dimensao:
+            indices = []
+            for celula_par, ids, total in [(self._celula_lead, self._lead, self.total_leads),
+                                           (self._celula_empresa, self._empresa, self.total_empresas)]:
+                chave = self._codigos_celula[dimensao][celula_par] * max(total, 1) + ids
+                ordem = np.argsort(chave, kind='stable')
+                chave = chave[ordem]
+                inicios = np.flatnonzero(np.r_[True, chave[1:] != chave[:-1]]) if len(chave) else chave
+                indices.append((celula_par[ordem], inicios, chave[inicios] // max(total, 1)))
+            self._indices_dimensao[dimensao] = indices
+        return self._indices_dimensao[dimensao]
+
+    def contar_por(self, dimensao, **filtros):
+        """Leads e empresas únicos por valor de `dimensao`, dentro dos filtros, do maior para o menor."""
+        selecionadas = self._celulas_selecionadas(filtros)
+        codigos_celula = self._codigos_celula[dimensao]
+        tamanho = len(self.valores[dimensao])
+        contagens = {}
+        for nome, (celulas, inicios, valores) in zip(['leads', 'empresas'], self._indice_dimensao(dimensao)):
+            # Um id conta uma vez por valor da dimensão se estiver em ao menos uma célula selecionada com esse valor.
+            presentes = np.logical_or.reduceat(selecionadas[celulas], inicios) if len(inicios) else inicios
+            contagens[nome] = np.bincount(valores[presentes.astype(bool)], minlength=tamanho)
+        contagens['linhas'] = np.bincount(codigos_celula[selecionadas], self._linhas_celula[selecionadas],
+                                          minlength=tamanho).astype(np.int64)
+        tabela = pd.DataFrame(contagens, index=pd.Index(self.valores[dimensao], name=dimensao))
+        return tabela[tabela['linhas'] > 0].sort_values(['leads', 'empresas'], ascending=False, kind='stable')
@@ -0,0 +1,157 @@
+# Arquivo: src/logic/cache_resultados.py
+# Cache em disco dos resultados de limpeza, endereçado pelo conteúdo do arquivo e pela versão das regras.
+import functools
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import tempfile
+
+from src.logic.data_cleaning import DICIONARIO_SEGMENTOS
+
+DIRETORIO_CACHE_PADRAO = os.path.join(os.path.expanduser('~'), '.agente_ldr', 'resultados')
+# Permite mover o cache (ex.: para um volume persistente do servidor).
+VARIAVEL_AMBIENTE_CACHE = 'AGENTE_LDR_CACHE_RESULTADOS'
+TAMANHO_MAXIMO_PADRAO_MB = 500
+EXTENSAO = '.pkl'
+
+# Módulos cujo código define o resultado da limpeza: qualquer alteração neles invalida o cache.
+MODULOS_LIMPEZA = (
+    'src.logic.data_cleaning', 'src.logic.ibge', 'src.logic.ingestao', 'src.logic.pipeline', 'src.logic.regras',
+    'src.logic.similaridade',
+)
+
+@functools.lru_cache(maxsize=1)
+def versao_limpeza():
+    """Hash do código de limpeza, de DICIONARIO_SEGMENTOS e da tabela de regras de normalização em uso."""
+    from src.logic.regras import carregar_regras
+
+    resumo = hashlib.sha256()
+    for nome in MODULOS_LIMPEZA:
+        with open(importlib.import_module(nome).__file__, 'rb') as arquivo:
+            resumo.update(arquivo.read())
+    resumo.update(json.dumps(DICIONARIO_SEGMENTOS, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    resumo.update(carregar_regras().versao.encode('utf-8'))
+    return resumo.hexdigest()[:16]
+
+def hash_conteudo(entrada):
+    """sha256 dos bytes do arquivo enviado (caminho, bytes ou objeto com getvalue/read)."""
+    resumo = hashlib.sha256()
+    if isinstance(entrada, (bytes, bytearray, memoryview)):
+        resumo.update(entrada)
+    elif hasattr(entrada, 'getvalue'):
+        resumo.update(entrada.getvalue())
+    elif hasattr(entrada, 'read'):
+        posicao = entrada.tell()
+        for parte in iter(lambda: entrada.read(1 << 20), b''):
+            resumo.update(parte)
+        entrada.seek(posicao)
+    else:
+        with open(entrada, 'rb') as arquivo:
+            for parte in iter(lambda: arquivo.read(1 << 20), b''):
+                resumo.update(parte)
+    return resumo.hexdigest()
+
+class CacheResultados:
+    """Resultados guardados em disco, um arquivo por chave, com despejo LRU pelo tamanho total.
+
+    O uso é marcado pela data de modificação do arquivo (atualizada a cada acerto), então a ordem LRU
+    sobrevive a reinícios do servidor e é compartilhada entre processos.
+    """
+
+    def __init__(self, diretorio=None, tamanho_maximo_mb=TAMANHO_MAXIMO_PADRAO_MB):
+        self.diretorio = diretorio or os.environ.get(VARIAVEL_AMBIENTE_CACHE) or DIRETORIO_CACHE_PADRAO
+        self.tamanho_maximo_bytes = int(tamanho_maximo_mb * 1_000_000)
+        self.acertos = 0
+        self.falhas = 0
+
+    def chave(self, entrada, indice, **opcoes):
+        """Chave do resultado: conteúdo do arquivo, versão da limpeza, versão do IBGE e opções que mudam a saída."""
+        partes = {
+            'conteudo': hash_conteudo(entrada),
+            'limpeza': versao_limpeza(),
+            'ibge': [indice.versao, indice.origem],
+            'opcoes': opcoes,
+        }
+        return hashlib.sha256(json.dumps(partes, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave + EXTENSAO)
+
+    def buscar(self, chave):
+        """O resultado guardado para `chave`, ou None."""
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'rb') as arquivo:
+                resultado = pickle.load(arquivo)
+            os.utime(caminho)
+        except FileNotFoundError:
+            self.falhas += 1
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Arquivo corrompido ou de uma versão incompatível do pandas: é descartado e recalculado.
+            self._remover(caminho)
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        return resultado
+
+    def guardar(self, chave, resultado):
+        os.makedirs(self.diretorio, exist_ok=True)
+        descritor, caminho_temporario = tempfile.mkstemp(dir=self.diretorio, suffix=EXTENSAO + '.tmp')
+        try:
+            with os.fdopen(descritor, 'wb') as arquivo:
+                pickle.dump(resultado, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(caminho_temporario, self._caminho(chave))
+        finally:
+            if os.path.exists(caminho_temporario):
+                os.remove(caminho_temporario)
+        self.despejar()
+
+    def _entradas(self):
+        entradas = []
+        if not os.path.isdir(self.diretorio):
+            return entradas
+        for item in os.scandir(self.diretorio):
+            if item.name.endswith(EXTENSAO):
+                try:
+                    estado = item.stat()
+                except FileNotFoundError:
+                    continue
+                entradas.append((estado.st_mtime, estado.st_size, item.path))
+        return entradas
+
+    @staticmethod
+    def _remover(caminho):
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass
+
+    def despejar(self):
+        """Remove os resultados usados há mais tempo até o total caber no limite. Retorna quantos saíram."""
+        entradas = sorted(self._entradas())
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        removidos = 0
+        for _, tamanho, caminho in entradas:
+            if total <= self.tamanho_maximo_bytes:
+                break
+            self._remover(caminho)
+            total -= tamanho
+            removidos += 1
+        return removidos
+
+    def limpar(self):
+        for _, _, caminho in self._entradas():
+            self._remover(caminho)
+
+    def estatisticas(self):
+        entradas = self._entradas()
+        return {
+            'itens': len(entradas),
+            'tamanho_mb': sum(tamanho for _, tamanho, _ in entradas) / 1_000_000,
+            'tamanho_maximo_mb': self.tamanho_maximo_bytes / 1_000_000,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+        }
@@ -1,13 +1,112 @@
 # Arquivo: src/logic/data_cleaning.py (com todas as correções)
 import pandas as pd
+import numpy as np
 import re
+import threading
 import unicodedata
+from collections import OrderedDict
+
+from src.logic.regras import carregar_regras
 
 try:
     from dados_traducao import DICIONARIO_SEGMENTOS
 except ImportError:
     DICIONARIO_SEGMENTOS = {}
 
+class CacheLRU:
+    """Cache LRU limitado de resultados de transformações, compartilhável entre arquivos do mesmo processo."""
+
+    def __init__(self, tamanho_maximo=200_000):
+        self.tamanho_maximo = tamanho_maximo
+        self._dados = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.linhas = 0
+        self.valores_unicos = 0
+
+    def __len__(self):
+        return len(self._dados)
+
+    def buscar_varios(self, chaves):
+        """Retorna {chave: valor} apenas para as chaves presentes, atualizando a ordem de uso."""
+        encontrados = {}
+        with self._trava:
+            for chave in chaves:
+                if chave in self._dados:
+                    self._dados.move_to_end(chave)
+                    encontrados[chave] = self._dados[chave]
+            self.acertos += len(encontrados)
+            self.falhas += len(chaves) - len(encontrados)
+        return encontrados
+
+    def guardar_varios(self, itens):
+        with self._trava:
+            for chave, valor in itens:
+                self._dados[chave] = valor
+                self._dados.move_to_end(chave)
+            while len(self._dados) > self.tamanho_maximo:
+                self._dados.popitem(last=False)
+
+    def registrar_coluna(self, linhas, valores_unicos):
+        with self._trava:
+            self.linhas += linhas
+            self.valores_unicos += valores_unicos
+
+    def estatisticas(self):
+        consultas = self.acertos + self.falhas
+        return {
+            'itens': len(self._dados),
+            'tamanho_maximo': self.tamanho_maximo,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+            'linhas': self.linhas,
+            'valores_unicos': self.valores_unicos,
+            # Fração de chamadas evitadas por transformar só os valores distintos de cada coluna.
+            'reaproveitamento': 1 - self.valores_unicos / self.linhas if self.linhas else 0.0,
+        }
+
+def _fatorizar(colunas):
+    # Códigos de linha e lista de tuplas distintas; NaN vira None e é tratado como um valor comum.
+    codigos_combinados = np.zeros(len(colunas[0]), dtype=np.int64)
+    uniques_por_coluna = []
+    for coluna in colunas:
+        codigos, uniques = pd.factorize(coluna, use_na_sentinel=True)
+        uniques_por_coluna.append(list(uniques) + [None])
+        codigos_combinados = codigos_combinados * (len(uniques) + 1) + (codigos + 1)
+    codigos, combinacoes = pd.factorize(codigos_combinados)
+    valores = []
+    for combinacao in combinacoes:
+        tupla = []
+        for uniques in reversed(uniques_por_coluna):
+            combinacao, codigo = divmod(int(combinacao), len(uniques))
+            tupla.append(uniques[codigo - 1])
+        valores.append(tuple(reversed(tupla)))
+    return codigos, valores
+
+def aplicar_por_valores_unicos(func, *colunas, cache=None, nome=None):
+    """Aplica `func` só aos valores distintos (ou combinações distintas) das colunas e devolve uma Series alinhada."""
+    indice = colunas[0].index
+    if len(colunas[0]) == 0:
+        return pd.Series([], index=indice, dtype=object)
+    codigos, valores = _fatorizar(colunas)
+    usar_cache = cache is not None and nome is not None
+    conhecidos = cache.buscar_varios([(nome,) + v for v in valores]) if usar_cache else {}
+    resultados = np.empty(len(valores), dtype=object)
+    novos = []
+    for i, valor in enumerate(valores):
+        chave = (nome,) + valor
+        if chave in conhecidos:
+            resultados[i] = conhecidos[chave]
+        else:
+            resultados[i] = func(*(np.nan if v is None else v for v in valor))
+            novos.append((chave, resultados[i]))
+    if usar_cache:
+        cache.guardar_varios(novos)
+        cache.registrar_coluna(len(codigos), len(valores))
+    return pd.Series(resultados[codigos], index=indice, dtype=object)
+
 def normalizar_texto_para_comparacao(texto):
     if pd.isna(texto): return ""
     s = str(texto).lower().strip()
@@ -25,9 +124,14 @@ def title_case_com_excecoes(s, excecoes):
             resultado.append(palavra.capitalize())
     return ' '.join(resultado)
 
-def padronizar_nome_contato(row, df_columns):
+def encontrar_colunas_nome(df_columns):
+    """Colunas de nome e sobrenome, procuradas pelo nome do cabeçalho."""
     nome_col = next((col for col in df_columns if 'first name' in col.lower() or 'nome_lead' in col.lower()), None)
     sobrenome_col = next((col for col in df_columns if 'last name' in col.lower() or 'sobrenome_lead' in col.lower()), None)
+    return nome_col, sobrenome_col
+
+def padronizar_nome_contato(row, df_columns):
+    nome_col, sobrenome_col = encontrar_colunas_nome(df_columns)
     if not nome_col or pd.isna(row.get(nome_col)): return ''
     primeiro_nome = str(row[nome_col]).split()[0]
     sobrenome_completo = str(row.get(sobrenome_col, ''))
@@ -37,17 +141,66 @@ def padronizar_nome_contato(row, df_columns):
     nome_final = f"{primeiro_nome} {ultimo_sobrenome}".strip()
     return nome_final.title()
 
-def padronizar_nome_empresa(nome_empresa):
+# Conectivos como palavra inteira, em qualquer caixa (classes explícitas: mesma regra do .lower() da versão escalar).
+REGEX_CONECTIVOS = re.compile(r'(?<!\S)[dD](?:[eEaAoO]|[oOaA][sS])(?!\S)')
+
+def padronizar_nomes_contato(df, cache=None):
+    # Versão por coluna de padronizar_nome_contato: as colunas são localizadas uma vez e nenhuma Series
+    # é montada por linha; o .title() roda só nos nomes distintos.
+    nome_col, sobrenome_col = encontrar_colunas_nome(df.columns)
+    if not nome_col:
+        return pd.Series('', index=df.index, dtype=object)
+    nomes = df[nome_col].astype(object)
+    sem_nome = nomes.isna()
+    # dtype object mantém a semântica do str.split() e do módulo re da versão escalar.
+    primeiro_nome = nomes.where(~sem_nome, '').astype(str).astype(object).str.split().str[0].fillna('')
+
+    if sobrenome_col is None:
+        ultimo_sobrenome = ''
+    else:
+        # Sobrenome ausente passa pelo str() como na versão escalar: NaN vira 'nan' (resultado "Fulano Nan").
+        sobrenomes = df[sobrenome_col].astype(object)
+        ausentes = sobrenomes.isna()
+        sobrenomes = sobrenomes.where(~ausentes, sobrenomes[ausentes].map(str)).astype(str).astype(object)
+        ultimo_sobrenome = sobrenomes.str.replace(REGEX_CONECTIVOS, '', regex=True).str.split().str[-1].fillna('')
+
+    nome_final = (primeiro_nome + ' ' + ultimo_sobrenome).str.strip()
+    nome_final = aplicar_por_valores_unicos(str.title, nome_final, cache=cache, nome='nome_contato')
+    return nome_final.where(~sem_nome, '')
+
+def _remover_sufixos_em_sequencia(nome_empresa, regras):
+    # Um padrão por vez, na ordem da tabela: só para nomes em que uma remoção pode formar outro sufixo.
+    for padrao in regras.padroes_sufixos:
+        nome_empresa = padrao.sub('', nome_empresa)
+    return nome_empresa
+
+def padronizar_nome_empresa(nome_empresa, regras=None):
     if pd.isna(nome_empresa): return ''
+    regras = regras or carregar_regras()
     nome_limpo = str(nome_empresa)
-    siglas = [
-        r'\sS\.A\.', r'\sS/A', r'\sS\.A', r'\sSA\.', r'\sSA\b',
-        r'\sLTDA\.?', r'\sLtda\.?', r'\sEIRELI\.?', r'\sMEI\.?',
-        r'\sME\b', r'\sEPP'
-    ]
-    for sigla in siglas:
-        nome_limpo = re.sub(sigla, '', nome_limpo, flags=re.IGNORECASE)
-    return title_case_com_excecoes(nome_limpo.strip(), ['de', 'da', 'do', 'dos', 'das', 'e'])
+    if regras.regex_sufixo_colado.search(nome_limpo):
+        nome_limpo = _remover_sufixos_em_sequencia(nome_limpo, regras)
+    else:
+        nome_limpo = regras.regex_sufixos.sub('', nome_limpo)
+    return title_case_com_excecoes(nome_limpo.strip(), regras.excecoes_minusculas_empresa)
+
+def padronizar_nomes_empresa(nomes, regras=None, cache=None):
+    # Versão por coluna de padronizar_nome_empresa: todos os sufixos saem numa única passada da regex
+    # combinada, aplicada com .str aos valores distintos; o title case também roda uma vez por nome distinto.
+    regras = regras or carregar_regras()
+    codigos, distintos = pd.factorize(nomes.astype(object), use_na_sentinel=True)
+    distintos = pd.Series(distintos, dtype=object).astype(str).astype(object)
+    limpos = distintos.str.replace(regras.regex_sufixos, '', regex=True)
+    colados = distintos.str.count(regras.regex_sufixo_colado) > 0
+    if colados.any():
+        limpos[colados] = distintos[colados].map(lambda nome: _remover_sufixos_em_sequencia(nome, regras))
+    limpos = limpos.str.strip()
+    titulos = aplicar_por_valores_unicos(
+        lambda nome: title_case_com_excecoes(nome, regras.excecoes_minusculas_empresa), limpos,
+        cache=cache, nome=('nome_empresa', regras.versao)
+    )
+    resultado = np.append(titulos.to_numpy(dtype=object), '')[codigos]
+    return pd.Series(resultado, index=nomes.index, dtype=object)
 
 def padronizar_localidade_geral(valor, tipo, mapa_cidades, mapa_estados):
     if pd.isna(valor): return ''
@@ -64,29 +217,53 @@ def padronizar_localidade_geral(valor, tipo, mapa_cidades, mapa_estados):
         return mapa_paises.get(chave_busca, str(valor).capitalize())
     return valor
 
-def padronizar_site(site):
+def padronizar_cidade(valor, estado, indice):
+    # Municípios homônimos são resolvidos pela UF da própria linha; sem UF reconhecida, vale o mapa por nome.
+    if pd.isna(valor): return ''
+    sigla = indice.sigla_uf(estado)
+    if sigla:
+        nome_oficial = indice.cidades_por_uf.get((normalizar_texto_para_comparacao(str(valor)), sigla))
+        if nome_oficial:
+            return nome_oficial
+    return padronizar_localidade_geral(valor, 'cidade', indice.mapa_cidades, indice.mapa_estados)
+
+def padronizar_site(site, regras=None):
     if pd.isna(site) or str(site).strip() == '': return ''
+    regras = regras or carregar_regras()
     site_limpo = str(site).strip()
-    site_limpo = re.sub(r'^(https?://)?', '', site_limpo)
-    site_limpo = site_limpo.rstrip('/')
-    if not site_limpo.lower().startswith('www.'):
-        site_limpo = 'www.' + site_limpo
+    site_limpo = regras.regex_prefixo_url.sub('', site_limpo)
+    site_limpo = site_limpo.rstrip(regras.caracteres_finais_url_removidos)
+    if not site_limpo.lower().startswith(regras.prefixo_site.lower()):
+        site_limpo = regras.prefixo_site + site_limpo
     return site_limpo
 
+def padronizar_sites(sites, regras=None):
+    # Versão por coluna de padronizar_site, com as mesmas regras de prefixo aplicadas com .str.
+    regras = regras or carregar_regras()
+    sites_str = sites.astype(object).where(sites.notna(), '').astype(str).astype(object).str.strip()
+    vazios = sites_str == ''
+    sites_str = sites_str.str.replace(regras.regex_prefixo_url, '', regex=True)
+    sites_str = sites_str.str.rstrip(regras.caracteres_finais_url_removidos)
+    sem_prefixo = ~sites_str.str.lower().str.startswith(regras.prefixo_site.lower())
+    sites_str = sites_str.where(~sem_prefixo, regras.prefixo_site + sites_str)
+    return sites_str.where(~vazios, '')
+
+# Conjunto pré-calculado: a busca de DDD é O(1) e não recria a lista a cada chamada.
+DDDS_VALIDOS = frozenset([
+    '11', '12', '13', '14', '15', '16', '17', '18', '19', '21', '22',
+    '24', '27', '28', '31', '32', '33', '34', '35', '37', '38', '41',
+    '42', '43', '44', '45', '46', '47', '48', '49', '51', '53', '54',
+    '55', '61', '62', '63', '64', '65', '66', '67', '68', '69', '71',
+    '73', '74', '75', '77', '79', '81', '82', '83', '84', '85', '86',
+    '87', '88', '89', '91', '92', '93', '94', '95', '96', '97', '98', '99'
+])
+
 def padronizar_telefone(telefone):
     if pd.isna(telefone):
         return ''
     tel_str = str(telefone).strip()
     if tel_str.startswith('+') and not tel_str.startswith('+55'):
         return ''
-    DDDs_VALIDOS = [
-        '11', '12', '13', '14', '15', '16', '17', '18', '19', '21', '22',
-        '24', '27', '28', '31', '32', '33', '34', '35', '37', '38', '41',
-        '42', '43', '44', '45', '46', '47', '48', '49', '51', '53', '54',
-        '55', '61', '62', '63', '64', '65', '66', '67', '68', '69', '71',
-        '73', '74', '75', '77', '79', '81', '82', '83', '84', '85', '86',
-        '87', '88', '89', '91', '92', '93', '94', '95', '96', '97', '98', '99'
-    ]
     apenas_digitos = re.sub(r'\D', '', tel_str)
     if apenas_digitos.startswith('55'):
         apenas_digitos = apenas_digitos[2:]
@@ -95,7 +272,7 @@ def padronizar_telefone(telefone):
     if apenas_digitos.startswith('0800') or apenas_digitos.startswith('800'):
         return ''
     ddd = apenas_digitos[:2]
-    if len(apenas_digitos) not in [10, 11] or ddd not in DDDs_VALIDOS:
+    if len(apenas_digitos) not in [10, 11] or ddd not in DDDS_VALIDOS:
         return ''
     if len(apenas_digitos) == 11 and apenas_digitos[2] != '9':
         return ''
@@ -107,6 +284,29 @@ def padronizar_telefone(telefone):
         return f"({ddd}) {apenas_digitos[2:6]}-{apenas_digitos[6:]}"
     return ''
 
+def padronizar_telefones(telefones):
+    # Versão por coluna de padronizar_telefone: mesmas regras, aplicadas com .str sobre a Series inteira.
+    nulos = telefones.isna().to_numpy()
+    # dtype object garante a mesma semântica de regex (módulo re) da versão escalar.
+    tel_str = telefones.astype(object).where(~nulos, '').astype(str).astype(object).str.strip()
+    internacional = tel_str.str.startswith('+') & ~tel_str.str.startswith('+55')
+    digitos = tel_str.str.replace(r'\D', '', regex=True)
+    digitos = digitos.where(~digitos.str.startswith('55'), digitos.str[2:])
+    digitos = digitos.where(~((digitos.str.len() == 11) & digitos.str.startswith('0')), digitos.str[1:])
+    tamanho = digitos.str.len()
+    ddd = digitos.str[:2]
+    terceiro = digitos.str[2:3]
+    invalido = (
+        nulos | internacional
+        | digitos.str.startswith('0800') | digitos.str.startswith('800')
+        | ~tamanho.isin([10, 11]) | ~ddd.isin(DDDS_VALIDOS)
+        | ((tamanho == 11) & (terceiro != '9'))
+        | ((tamanho == 10) & ~terceiro.isin(['2', '3', '4', '5']))
+    )
+    celular = '(' + ddd + ') ' + digitos.str[2:7] + '-' + digitos.str[7:]
+    fixo = '(' + ddd + ') ' + digitos.str[2:6] + '-' + digitos.str[6:]
+    return celular.where(tamanho == 11, fixo).where(~invalido, '')
+
 def padronizar_segmento(segmento):
     if pd.isna(segmento): return ''
     segmento_norm = str(segmento).lower().strip().replace('&', 'and')
@@ -0,0 +1,150 @@
+# Arquivo: src/logic/exportacao.py
+# Exportação dos leads limpos em CSV, Parquet e Arrow IPC, sempre gravando em blocos direto no destino.
+import io
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# formato -> (extensão, tipo MIME)
+FORMATOS_EXPORTACAO = {
+    'csv': ('.csv', 'text/csv'),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('.arrow', 'application/vnd.apache.arrow.file'),
+}
+# Gravadas como int64 só quando todos os valores preenchidos são inteiros (faixas como '51-200' ficam texto).
+COLUNAS_INTEIRAS = {'Numero_Funcionarios'}
+COMPRESSAO_PADRAO = 'zstd'
+TAMANHO_BLOCO_CSV = 50_000
+DIRETORIO_EXPORTACOES = os.path.join(tempfile.gettempdir(), 'agente_ldr', 'exportacoes')
+# Arquivos de download de sessões abandonadas saem depois desse tempo sem uso.
+IDADE_MAXIMA_EXPORTACOES_HORAS = 24
+
+def formatos_disponiveis():
+    return [f for f in FORMATOS_EXPORTACAO if f == 'csv' or pa is not None]
+
+def _so_inteiros(serie):
+    # Confere só os valores distintos: a coluna costuma ter poucos.
+    valores = pd.Series(serie.dropna().unique()).astype(object)
+    numeros = pd.to_numeric(valores[valores != ''], errors='coerce')
+    return bool(numeros.notna().all() and ((numeros % 1 == 0) & (numeros.abs() < 2 ** 63)).all())
+
+def esquema_arrow(df, inteiros=True):
+    """Esquema fixo por nome de coluna: o mesmo para todos os blocos de um arquivo.
+
+    Com `inteiros`, as COLUNAS_INTEIRAS viram int64 quando todos os seus valores preenchidos em `df` são
+    inteiros; caso contrário ficam como texto, igual ao CSV, sem transformar nenhum valor em nulo.
+    """
+    return pa.schema([
+        (col, pa.int64() if inteiros and col in COLUNAS_INTEIRAS and _so_inteiros(df[col]) else pa.string())
+        for col in df.columns
+    ])
+
+def tabela_arrow(df, esquema=None):
+    """Converte o DataFrame limpo para Arrow tipado: texto vazio vira nulo e contagens viram inteiros."""
+    esquema = esquema or esquema_arrow(df)
+    convertido = {}
+    for col in df.columns:
+        serie = df[col]
+        if esquema.field(col).type == pa.int64():
+            convertido[col] = pd.to_numeric(serie.astype(object).where(serie != '', None)).astype('Int64')
+        else:
+            convertido[col] = serie.astype(object).where(serie.notna() & (serie != ''), None)
+    return pa.Table.from_pandas(pd.DataFrame(convertido), schema=esquema, preserve_index=False)
+
+def _gravar_csv_em_blocos(blocos, arquivo_saida):
+    total_linhas = 0
+    for i, bloco in enumerate(blocos):
+        bloco.to_csv(arquivo_saida, sep=';', index=False, header=i == 0)
+        total_linhas += len(bloco)
+    return total_linhas
+
+def _abrir_gravador_colunar(destino, formato, esquema, compressao):
+    if formato == 'parquet':
+        return pq.ParquetWriter(destino, esquema, compression=compressao)
+    opcoes = pa.ipc.IpcWriteOptions(compression=compressao)
+    return pa.ipc.new_file(destino, esquema, options=opcoes)
+
+def gravar_blocos(blocos, destino, formato='csv', compressao=COMPRESSAO_PADRAO, esquema=None):
+    """Grava uma sequência de DataFrames no destino, um bloco por vez. Retorna o total de linhas.
+
+    Sem `esquema`, os blocos seguintes ainda não são conhecidos quando o arquivo é aberto: todas as colunas
+    são gravadas como texto, para que um valor não inteiro num bloco posterior não vire nulo.
+    """
+    if formato == 'csv':
+        if isinstance(destino, io.TextIOBase):
+            return _gravar_csv_em_blocos(blocos, destino)
+        with open(destino, 'w', encoding='utf-8-sig', newline='') as arquivo_saida:
+            return _gravar_csv_em_blocos(blocos, arquivo_saida)
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato de exportação desconhecido: {formato}")
+    if pa is None:
+        raise ImportError(f"A exportação em {formato} requer o pacote pyarrow.")
+
+    gravador, total_linhas = None, 0
+    try:
+        for bloco in blocos:
+            if gravador is None:
+                esquema = esquema or esquema_arrow(bloco, inteiros=False)
+                gravador = _abrir_gravador_colunar(destino, formato, esquema, compressao)
+            gravador.write_table(tabela_arrow(bloco, esquema))
+            total_linhas += len(bloco)
+    finally:
+        if gravador is not None:
+            gravador.close()
+    return total_linhas
+
+def exportar(df, destino, formato='csv', compressao=COMPRESSAO_PADRAO, tamanho_bloco=TAMANHO_BLOCO_CSV):
+    """Grava um DataFrame inteiro no destino, em blocos, sem montar o arquivo todo em memória."""
+    blocos = (df.iloc[i:i + tamanho_bloco] for i in range(0, max(len(df), 1), tamanho_bloco))
+    # Com o DataFrame inteiro em mãos, o tipo de cada coluna é decidido por todos os valores.
+    esquema = esquema_arrow(df) if formato != 'csv' and pa is not None else None
+    return gravar_blocos(blocos, destino, formato, compressao, esquema)
+
+def exportar_em_cache(df, formato, chave, diretorio=DIRETORIO_EXPORTACOES):
+    """Gera o arquivo de `formato` para o resultado identificado por `chave` só na primeira vez e devolve o caminho."""
+    extensao, _ = FORMATOS_EXPORTACAO[formato]
+    caminho = os.path.join(diretorio, f"{chave}{extensao}")
+    if os.path.exists(caminho):
+        os.utime(caminho)
+        return caminho
+    os.makedirs(diretorio, exist_ok=True)
+    remover_exportacoes_antigas(diretorio)
+    descritor, caminho_temporario = tempfile.mkstemp(dir=diretorio, suffix=extensao + '.tmp')
+    os.close(descritor)
+    try:
+        exportar(df, caminho_temporario, formato)
+        os.replace(caminho_temporario, caminho)
+    finally:
+        if os.path.exists(caminho_temporario):
+            os.remove(caminho_temporario)
+    return caminho
+
+def remover_exportacoes(chave, diretorio=DIRETORIO_EXPORTACOES):
+    for extensao, _ in FORMATOS_EXPORTACAO.values():
+        caminho = os.path.join(diretorio, f"{chave}{extensao}")
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+def remover_exportacoes_antigas(diretorio=DIRETORIO_EXPORTACOES, idade_maxima_horas=IDADE_MAXIMA_EXPORTACOES_HORAS):
+    """Remove os arquivos sem uso há mais de `idade_maxima_horas` (sessões encerradas sem nova limpeza)."""
+    if not os.path.isdir(diretorio):
+        return 0
+    limite = time.time() - idade_maxima_horas * 3600
+    removidos = 0
+    for item in os.scandir(diretorio):
+        try:
+            if item.is_file() and item.stat().st_mtime < limite:
+                os.remove(item.path)
+                removidos += 1
+        except FileNotFoundError:
+            continue
+    return removidos
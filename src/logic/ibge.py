@@ -0,0 +1,151 @@
+# Arquivo: src/logic/ibge.py
+# Índice de localidades do IBGE com snapshot local: a rede é só um caminho opcional de atualização.
+import argparse
+import datetime
+import functools
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass
+
+import requests
+
+from src.logic.data_cleaning import normalizar_texto_para_comparacao
+
+logger = logging.getLogger(__name__)
+
+URL_MUNICIPIOS = "https://servicodados.ibge.gov.br/api/v1/localidades/municipios"
+
+# O número do formato faz parte do nome do arquivo: um snapshot antigo nunca é lido por engano.
+# Gravado a partir da API na primeira execução com rede (ou com --atualizar); as seguintes não dependem dela.
+# Texto JSON em vez de um formato binário: lê em poucos milissegundos e pode ser versionado com diffs legíveis.
+VERSAO_FORMATO_SNAPSHOT = 2
+CAMINHO_SNAPSHOT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'data', f'ibge_localidades_v{VERSAO_FORMATO_SNAPSHOT}.json'
+)
+
+# As 27 UFs mudam raramente; ficam embutidas para que estados funcionem mesmo sem snapshot nem rede.
+UFS = {
+    'ac': 'Acre', 'al': 'Alagoas', 'ap': 'Amapá', 'am': 'Amazonas', 'ba': 'Bahia',
+    'ce': 'Ceará', 'df': 'Distrito Federal', 'es': 'Espírito Santo', 'go': 'Goiás',
+    'ma': 'Maranhão', 'mt': 'Mato Grosso', 'ms': 'Mato Grosso do Sul', 'mg': 'Minas Gerais',
+    'pa': 'Pará', 'pb': 'Paraíba', 'pr': 'Paraná', 'pe': 'Pernambuco', 'pi': 'Piauí',
+    'rj': 'Rio de Janeiro', 'rn': 'Rio Grande do Norte', 'rs': 'Rio Grande do Sul',
+    'ro': 'Rondônia', 'rr': 'Roraima', 'sc': 'Santa Catarina', 'sp': 'São Paulo',
+    'se': 'Sergipe', 'to': 'Tocantins'
+}
+
+@dataclass(frozen=True)
+class IndiceLocalidades:
+    versao: str
+    origem: str
+    mapa_cidades: dict
+    mapa_estados: dict
+    cidades_por_uf: dict
+    siglas_estados: dict
+
+    def sigla_uf(self, estado):
+        """Converte sigla ou nome de estado (em qualquer grafia) para a sigla minúscula, ou None."""
+        chave = normalizar_texto_para_comparacao(estado)
+        if 'federal district' in chave:
+            return 'df'
+        return self.siglas_estados.get(chave.replace('state of ', '').strip())
+
+def _sigla_do_municipio(municipio):
+    # Alguns municípios recentes vêm sem microrregião; a região imediata também aponta para a UF.
+    try:
+        return municipio['microrregiao']['mesorregiao']['UF']['sigla']
+    except (KeyError, TypeError):
+        pass
+    try:
+        return municipio['regiao-imediata']['regiao-intermediaria']['UF']['sigla']
+    except (KeyError, TypeError):
+        return None
+
+def baixar_municipios_ibge(timeout=30):
+    """Baixa os municípios da API do IBGE como tuplas (id, nome, sigla da UF)."""
+    response_municipios = requests.get(URL_MUNICIPIOS, timeout=timeout)
+    response_municipios.raise_for_status()
+    return [
+        (m.get('id'), m['nome'], _sigla_do_municipio(m))
+        for m in response_municipios.json() if 'nome' in m
+    ]
+
+def salvar_snapshot(municipios, caminho=CAMINHO_SNAPSHOT, versao=None):
+    versao = versao or datetime.date.today().isoformat()
+    # Um município por linha: uma atualização aparece no diff só com os municípios que mudaram.
+    linhas = ',\n'.join(json.dumps(list(m), ensure_ascii=False) for m in municipios)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    caminho_temporario = caminho + '.tmp'
+    with open(caminho_temporario, 'w', encoding='utf-8', newline='\n') as arquivo:
+        arquivo.write(f'{{"versao_formato": {VERSAO_FORMATO_SNAPSHOT}, "versao": {json.dumps(versao)}, '
+                      f'"municipios": [\n{linhas}\n]}}\n')
+    os.replace(caminho_temporario, caminho)
+    ler_snapshot.cache_clear()
+    return versao
+
+@functools.lru_cache(maxsize=4)
+def ler_snapshot(caminho=CAMINHO_SNAPSHOT):
+    """Lê o snapshot local (uma única vez por processo). Retorna None se não existir."""
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    if dados.get('versao_formato') != VERSAO_FORMATO_SNAPSHOT:
+        return None
+    return dados
+
+def montar_indice(municipios, versao, origem):
+    mapa_estados = {}
+    siglas_estados = {}
+    for sigla, nome in UFS.items():
+        mapa_estados[sigla] = nome
+        mapa_estados[normalizar_texto_para_comparacao(nome)] = nome
+        siglas_estados[sigla] = sigla
+        siglas_estados[normalizar_texto_para_comparacao(nome)] = sigla
+
+    mapa_cidades = {}
+    cidades_por_uf = {}
+    for _, nome, sigla in municipios:
+        chave = normalizar_texto_para_comparacao(nome)
+        mapa_cidades[chave] = nome
+        if sigla:
+            cidades_por_uf[(chave, sigla.lower())] = nome
+    return IndiceLocalidades(versao, origem, mapa_cidades, mapa_estados, cidades_por_uf, siglas_estados)
+
+def carregar_indice_ibge(atualizar=False, timeout=30, caminho=CAMINHO_SNAPSHOT):
+    """Carrega o índice de localidades: snapshot local primeiro, rede só se pedido ou se não houver snapshot."""
+    snapshot = None if atualizar else ler_snapshot(caminho)
+    if snapshot is None:
+        try:
+            municipios = baixar_municipios_ibge(timeout)
+        except (requests.RequestException, ValueError) as e:
+            logger.warning("Não foi possível atualizar as localidades do IBGE pela rede: %s", e)
+            snapshot = ler_snapshot(caminho)
+        else:
+            versao = datetime.date.today().isoformat()
+            indice = montar_indice(municipios, versao, 'rede')
+            # Uma pasta somente leitura (ex.: num contêiner) não descarta a lista recém-baixada.
+            try:
+                salvar_snapshot(municipios, caminho, versao)
+            except OSError as e:
+                logger.warning("Não foi possível gravar o snapshot do IBGE em %s: %s", caminho, e)
+            return indice
+    if snapshot is None:
+        return montar_indice([], 'somente-ufs', 'embutido')
+    return montar_indice(snapshot['municipios'], snapshot['versao'], 'snapshot')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gerencia o snapshot local de localidades do IBGE.")
+    parser.add_argument('--atualizar', action='store_true', help="Baixa a lista atual do IBGE e regrava o snapshot.")
+    args = parser.parse_args(argv)
+
+    indice = carregar_indice_ibge(atualizar=args.atualizar)
+    print(f"Localidades IBGE: versão {indice.versao} (origem: {indice.origem}), "
+          f"{len(indice.cidades_por_uf)} municípios, snapshot em {CAMINHO_SNAPSHOT}")
+    return 0 if indice.origem != 'embutido' else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
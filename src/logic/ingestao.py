@@ -0,0 +1,305 @@
+# Arquivo: src/logic/ingestao.py
+# Leitura de CSV em uma única passada: separador, codificação e cabeçalho são detectados numa amostra do início.
+import codecs
+import csv
+import io
+import os
+import time
+import warnings
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    MOTOR_RAPIDO = 'pyarrow'
+    # Texto para as operações vetorizadas (.str) de todo o projeto: com pyarrow, rodam nos kernels do Arrow.
+    TIPO_TEXTO = pd.StringDtype('pyarrow')
+except ImportError:
+    MOTOR_RAPIDO = None
+    TIPO_TEXTO = pd.StringDtype()
+
+TAMANHO_AMOSTRA = 64 * 1024
+SEPARADORES_CANDIDATOS = ',;\t|'
+# Exportações do Excel em português costumam vir em cp1252; latin-1 aceita qualquer byte e fecha a lista.
+CODIFICACOES_CANDIDATAS = ('utf-8-sig', 'cp1252', 'latin-1')
+LINHAS_PROCURA_CABECALHO = 10
+# Textos lidos como célula vazia pelos dois motores (os mesmos marcadores que o pandas usa por padrão), fixados
+# aqui para que a leitura não dependa da versão do pandas.
+VALORES_AUSENTES = (
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA',
+    'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+)
+# Tipo das colunas lidas com dtype=str pelo motor C (object no pandas 2, 'str' no pandas 3): o motor pyarrow
+# devolve o mesmo, para que a página e a linha de comando produzam exatamente a mesma saída.
+TIPO_LIDO = pd.Series(dtype=str).dtype
+
+@dataclass
+class FormatoCSV:
+    separador: str
+    codificacao: str
+    linha_cabecalho: int
+
+@dataclass
+class RelatorioIngestao:
+    motor: str = ''
+    separador: str = ''
+    codificacao: str = ''
+    bytes_lidos: int = 0
+    linhas: int = 0
+    linhas_descartadas: int = 0
+    segundos: float = 0.0
+
+    @property
+    def linhas_por_segundo(self):
+        return self.linhas / self.segundos if self.segundos else 0.0
+
+    @property
+    def mb_por_segundo(self):
+        return self.bytes_lidos / 1_000_000 / self.segundos if self.segundos else 0.0
+
+    def resumo(self):
+        return (f"{self.linhas} linhas lidas em {self.segundos:.2f}s "
+                f"({self.linhas_por_segundo:,.0f} linhas/s, {self.mb_por_segundo:.1f} MB/s, motor {self.motor}, "
+                f"separador {self.separador!r}, codificação {self.codificacao}); "
+                f"{self.linhas_descartadas} linhas malformadas ignoradas")
+
+def _rebobinar(entrada):
+    if hasattr(entrada, 'seek'):
+        entrada.seek(0)
+
+def _ler_amostra(entrada, tamanho=TAMANHO_AMOSTRA):
+    if hasattr(entrada, 'read'):
+        amostra = entrada.read(tamanho)
+        entrada.seek(0)
+    else:
+        with open(entrada, 'rb') as arquivo:
+            amostra = arquivo.read(tamanho)
+    if isinstance(amostra, str):
+        amostra = amostra.encode('utf-8')
+    return amostra
+
+def _tamanho_em_bytes(entrada):
+    if hasattr(entrada, 'read'):
+        tamanho = entrada.seek(0, io.SEEK_END)
+        entrada.seek(0)
+        return tamanho
+    return os.path.getsize(entrada)
+
+def detectar_codificacao(amostra, fim_do_arquivo=False):
+    for codificacao in CODIFICACOES_CANDIDATAS:
+        # Decodificador incremental: um caractere multibyte cortado no fim da amostra não é erro.
+        decodificador = codecs.getincrementaldecoder(codificacao)()
+        try:
+            decodificador.decode(amostra, final=fim_do_arquivo)
+            return codificacao
+        except UnicodeDecodeError:
+            continue
+    return CODIFICACOES_CANDIDATAS[-1]
+
+def _detectar_separador(linhas):
+    try:
+        return csv.Sniffer().sniff('\n'.join(linhas), delimiters=SEPARADORES_CANDIDATOS).delimiter
+    except csv.Error:
+        # Sniffer indeciso: fica o candidato mais frequente no cabeçalho (',' em caso de empate).
+        return max(SEPARADORES_CANDIDATOS, key=lambda sep: (linhas[0].count(sep), sep == ','))
+
+def _colunas_conhecidas_na_linha(linha, separador, conhecidas):
+    campos = next(csv.reader([linha], delimiter=separador), [])
+    return len(conhecidas & {c.strip().lower() for c in campos})
+
+def _localizar_cabecalho(linhas, conhecidas):
+    """(índice, separador) da primeira linha com alguma coluna conhecida, ou (None, None)."""
+    # O índice conta também as linhas em branco, como o `skiprows` do pandas.
+    for i, linha in enumerate(linhas[:LINHAS_PROCURA_CABECALHO]):
+        acertos = {sep: _colunas_conhecidas_na_linha(linha, sep, conhecidas) for sep in SEPARADORES_CANDIDATOS}
+        separador = max(acertos, key=acertos.get)
+        if acertos[separador]:
+            return i, separador
+    return None, None
+
+def detectar_formato(entrada, colunas_conhecidas=()):
+    """Detecta separador, codificação e linha de cabeçalho lendo só os primeiros bytes do arquivo.
+
+    Com `colunas_conhecidas`, o cabeçalho é a primeira linha que contém alguma delas; se nenhuma linha
+    contém, o arquivo não é do formato esperado e a leitura para com ValueError.
+    """
+    _rebobinar(entrada)
+    amostra = _ler_amostra(entrada)
+    fim_do_arquivo = len(amostra) < TAMANHO_AMOSTRA
+    codificacao = detectar_codificacao(amostra, fim_do_arquivo)
+    texto = codecs.getincrementaldecoder(codificacao)(errors='replace').decode(amostra, final=fim_do_arquivo)
+    linhas = texto.splitlines()
+    if not fim_do_arquivo and len(linhas) > 1:
+        linhas = linhas[:-1]  # a última linha da amostra pode estar incompleta
+
+    conhecidas = {c.strip().lower() for c in colunas_conhecidas}
+    linha_cabecalho, separador_cabecalho = 0, None
+    if conhecidas:
+        linha_cabecalho, separador_cabecalho = _localizar_cabecalho(linhas, conhecidas)
+        if linha_cabecalho is None:
+            raise ValueError(f"Nenhuma coluna esperada ({', '.join(list(colunas_conhecidas)[:5])}...) foi "
+                             f"encontrada nas primeiras {LINHAS_PROCURA_CABECALHO} linhas do arquivo.")
+    # Do cabeçalho em diante: linhas de preâmbulo ("Exported from ...") antes dele confundem o Sniffer.
+    nao_vazias = [linha for linha in linhas[linha_cabecalho:] if linha.strip()] or ['']
+    separador = _detectar_separador(nao_vazias[:50])
+    if separador_cabecalho and (_colunas_conhecidas_na_linha(linhas[linha_cabecalho], separador, conhecidas)
+                                < _colunas_conhecidas_na_linha(linhas[linha_cabecalho], separador_cabecalho,
+                                                               conhecidas)):
+        separador = separador_cabecalho
+    return FormatoCSV(separador, codificacao, linha_cabecalho)
+
+def _erro_de_codificacao(erro):
+    # O motor C levanta UnicodeDecodeError; o pyarrow, ArrowInvalid ("invalid UTF8 data").
+    return isinstance(erro, UnicodeDecodeError) or 'UTF8' in str(erro)
+
+def _proxima_codificacao(formato):
+    # A codificação vem só da amostra inicial: um byte cp1252 mais adiante derruba a leitura em UTF-8.
+    posicao = CODIFICACOES_CANDIDATAS.index(formato.codificacao)
+    return replace(formato, codificacao=CODIFICACOES_CANDIDATAS[posicao + 1])
+
+def _contar_linhas_descartadas(avisos):
+    # O motor C agrupa várias linhas por aviso ("Skipping line N: ..."); o pyarrow emite um aviso por linha.
+    total = 0
+    for aviso in avisos:
+        mensagem = str(aviso.message)
+        if issubclass(aviso.category, pd.errors.ParserWarning):
+            total += mensagem.count('Skipping line') or int(mensagem.startswith('Expected'))
+    return total
+
+def _argumentos_leitura(formato):
+    return dict(
+        sep=formato.separador, encoding=formato.codificacao, skiprows=formato.linha_cabecalho,
+        on_bad_lines='warn', dtype=str, keep_default_na=False, na_values=list(VALORES_AUSENTES)
+    )
+
+def _selecionar_colunas(df, colunas):
+    df.columns = df.columns.str.strip()
+    if colunas is None:
+        return df
+    return df[[c for c in df.columns if c in colunas]]
+
+def _ler_com_pyarrow(entrada, formato, colunas):
+    """Lê com o leitor de CSV do pyarrow, todas as colunas como texto e sem inferência de tipos.
+
+    O motor 'pyarrow' do pandas infere números antes de aplicar dtype=str ('00123' vira '123' e, no pandas 2,
+    vazios viram 'None'); aqui o resultado é o mesmo do motor C. Retorna (DataFrame, linhas descartadas), ou
+    None se alguma linha tem campos a menos (o motor C as completa com vazios; o pyarrow não).
+    """
+    cabecalho = list(pd.read_csv(entrada, nrows=0, **_argumentos_leitura(formato)).columns)
+    _rebobinar(entrada)
+    linhas = {'descartadas': 0, 'curtas': 0}
+
+    def tratar_linha_invalida(linha):
+        if linha.actual_columns < linha.expected_columns:
+            linhas['curtas'] += 1
+            return 'error'
+        linhas['descartadas'] += 1
+        return 'skip'
+
+    # O pyarrow já descarta o BOM do UTF-8; outras codificações são convertidas por ele mesmo.
+    codificacao = 'utf8' if formato.codificacao == 'utf-8-sig' else formato.codificacao
+    try:
+        tabela = pa_csv.read_csv(
+            entrada,
+            read_options=pa_csv.ReadOptions(encoding=codificacao),
+            parse_options=pa_csv.ParseOptions(delimiter=formato.separador, newlines_in_values=True,
+                                              invalid_row_handler=tratar_linha_invalida),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={coluna: pa.string() for coluna in cabecalho},
+                include_columns=[c for c in cabecalho if colunas is None or c.strip() in colunas],
+                null_values=list(VALORES_AUSENTES), strings_can_be_null=True,
+            ),
+        )
+    except pa.ArrowInvalid:
+        if linhas['curtas']:
+            _rebobinar(entrada)
+            return None
+        raise
+    df = tabela.to_pandas()
+    if TIPO_LIDO == object:
+        # pandas 2: o texto chega como object com None nos vazios, e o motor C usa NaN.
+        valores = df.to_numpy(dtype=object)
+        valores[pd.isna(valores)] = np.nan
+        df = pd.DataFrame(valores, index=df.index, columns=df.columns)
+    elif not (df.dtypes == TIPO_LIDO).all():
+        df = df.astype(TIPO_LIDO)
+    return df, linhas['descartadas']
+
+def _ler_com_pandas(entrada, formato):
+    with warnings.catch_warnings(record=True) as avisos:
+        warnings.simplefilter('always', pd.errors.ParserWarning)
+        df = pd.read_csv(entrada, engine='c', **_argumentos_leitura(formato))
+    return df, _contar_linhas_descartadas(avisos)
+
+def ler_csv(entrada, colunas=None, formato=None, relatorio=None):
+    """Lê o CSV inteiro numa única passada, com o pyarrow quando disponível e só as colunas pedidas."""
+    formato = formato or detectar_formato(entrada, colunas or ())
+    colunas = set(colunas) if colunas is not None else None
+    tamanho = _tamanho_em_bytes(entrada)
+    inicio = time.perf_counter()
+    while True:
+        # O pyarrow não pula linhas antes do cabeçalho; nesse caso raro o motor C assume.
+        motor = MOTOR_RAPIDO if MOTOR_RAPIDO and formato.linha_cabecalho == 0 else 'c'
+        try:
+            lido = _ler_com_pyarrow(entrada, formato, colunas) if motor == 'pyarrow' else None
+            if lido is None:
+                motor = 'c'
+                lido = _ler_com_pandas(entrada, formato)
+            break
+        except ValueError as erro:
+            if not _erro_de_codificacao(erro):
+                raise
+            formato = _proxima_codificacao(formato)
+            _rebobinar(entrada)
+    df, descartadas = lido
+    df = _selecionar_colunas(df, colunas)
+    if relatorio is not None:
+        relatorio.motor, relatorio.separador, relatorio.codificacao = motor, formato.separador, formato.codificacao
+        relatorio.bytes_lidos += tamanho
+        relatorio.linhas += len(df)
+        relatorio.linhas_descartadas += descartadas
+        relatorio.segundos += time.perf_counter() - inicio
+    return df
+
+def ler_csv_em_blocos(entrada, tamanho_bloco, colunas=None, formato=None, relatorio=None):
+    """Lê o CSV em blocos de `tamanho_bloco` linhas (motor C), para arquivos maiores que a memória."""
+    formato = formato or detectar_formato(entrada, colunas or ())
+    colunas = set(colunas) if colunas is not None else None
+    relatorio = relatorio if relatorio is not None else RelatorioIngestao()
+    relatorio.motor, relatorio.separador, relatorio.codificacao = 'c', formato.separador, formato.codificacao
+    relatorio.bytes_lidos += _tamanho_em_bytes(entrada)
+    descartadas_antes = relatorio.linhas_descartadas
+    emitidas = 0
+    while True:
+        # Numa nova tentativa com outra codificação, o arquivo é relido do início: as linhas já entregues
+        # são puladas e as malformadas, contadas de novo desde o começo.
+        a_pular = emitidas
+        relatorio.linhas_descartadas = descartadas_antes
+        try:
+            # Sem usecols aqui: com usecols o motor C deixa de detectar linhas com campos a mais.
+            with pd.read_csv(entrada, chunksize=tamanho_bloco, **_argumentos_leitura(formato)) as leitor:
+                while True:
+                    inicio = time.perf_counter()
+                    with warnings.catch_warnings(record=True) as avisos:
+                        warnings.simplefilter('always', pd.errors.ParserWarning)
+                        bloco = next(leitor, None)
+                    relatorio.segundos += time.perf_counter() - inicio
+                    relatorio.linhas_descartadas += _contar_linhas_descartadas(avisos)
+                    if bloco is None:
+                        return
+                    if a_pular:
+                        bloco, a_pular = bloco.iloc[a_pular:], max(a_pular - len(bloco), 0)
+                        if bloco.empty:
+                            continue
+                    emitidas += len(bloco)
+                    relatorio.linhas += len(bloco)
+                    yield _selecionar_colunas(bloco, colunas)
+        except ValueError as erro:
+            if not _erro_de_codificacao(erro):
+                raise
+            formato = _proxima_codificacao(formato)
+            relatorio.codificacao = formato.codificacao
+            _rebobinar(entrada)
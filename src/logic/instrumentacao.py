@@ -0,0 +1,191 @@
+# Arquivo: src/logic/instrumentacao.py
+# Métricas por etapa da limpeza (tempo, linhas, descartes, memória) e perfilamento opcional por execução.
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MODOS_PERFIL = ('cprofile', 'pyinstrument')
+LINHAS_RELATORIO_CPROFILE = 40
+# Nível dos logs de src.logic (DEBUG, INFO, WARNING...) quando configurados por configurar_logs.
+VARIAVEL_AMBIENTE_NIVEL_LOG = 'LOG_LEVEL'
+NIVEL_LOG_PADRAO = 'INFO'
+
+@dataclass
+class MetricaEtapa:
+    etapa: str
+    segundos: float = 0.0
+    linhas_entrada: int = 0
+    linhas_saida: int = 0
+    linhas_rejeitadas: int = 0
+    memoria_delta_mb: float = 0.0
+    execucoes: int = 0
+
+def configurar_logs(nivel=None):
+    """Envia os logs de `src.logic` (incluindo as métricas JSON) para a saída de erro.
+
+    O nível vem de `nivel`, da variável LOG_LEVEL ou, por padrão, INFO. Pode ser chamada a cada nova execução
+    do script do Streamlit: o handler é adicionado uma única vez.
+    """
+    nivel = (nivel or os.environ.get(VARIAVEL_AMBIENTE_NIVEL_LOG) or NIVEL_LOG_PADRAO).upper()
+    if not isinstance(logging.getLevelName(nivel), int):
+        nivel = NIVEL_LOG_PADRAO
+    registrador = logging.getLogger('src.logic')
+    registrador.setLevel(nivel)
+    if not any(getattr(handler, 'agente_ldr', False) for handler in registrador.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        handler.agente_ldr = True
+        registrador.addHandler(handler)
+    return registrador
+
+def memoria_processo_mb():
+    """Memória residente atual do processo (Linux, via /proc); None onde não houver como medir."""
+    try:
+        with open('/proc/self/statm') as arquivo:
+            paginas_residentes = int(arquivo.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return paginas_residentes * os.sysconf('SC_PAGE_SIZE') / 1_000_000
+
+def _delta_memoria(memoria_inicial):
+    memoria_final = memoria_processo_mb()
+    if memoria_inicial is None or memoria_final is None:
+        return 0.0
+    return memoria_final - memoria_inicial
+
+class Instrumentacao:
+    """Acumula as métricas de cada etapa; etapas repetidas (uma por bloco) são somadas."""
+
+    def __init__(self):
+        self.etapas = {}
+
+    def registrar(self, etapa, segundos=0.0, linhas_entrada=0, linhas_saida=0, linhas_rejeitadas=0,
+                  memoria_delta_mb=0.0, execucoes=1):
+        metrica = self.etapas.setdefault(etapa, MetricaEtapa(etapa))
+        metrica.segundos += segundos
+        metrica.linhas_entrada += linhas_entrada
+        metrica.linhas_saida += linhas_saida
+        metrica.linhas_rejeitadas += linhas_rejeitadas
+        metrica.memoria_delta_mb += memoria_delta_mb
+        metrica.execucoes += execucoes
+
+    @contextmanager
+    def etapa(self, nome, linhas_entrada=0):
+        """Mede o bloco `with`; quem chama preenche `linhas_saida` e `linhas_rejeitadas` na métrica recebida."""
+        medicao = MetricaEtapa(nome, linhas_entrada=linhas_entrada, linhas_saida=None)
+        memoria_inicial = memoria_processo_mb()
+        inicio = time.perf_counter()
+        yield medicao
+        linhas_saida = medicao.linhas_entrada if medicao.linhas_saida is None else medicao.linhas_saida
+        self.registrar(nome, time.perf_counter() - inicio, medicao.linhas_entrada, linhas_saida,
+                       medicao.linhas_rejeitadas, _delta_memoria(memoria_inicial))
+
+    def medir_iteracao(self, blocos, nome):
+        """Repassa os blocos de um iterável contando como `nome` só o tempo gasto para produzir cada um."""
+        blocos = iter(blocos)
+        while True:
+            memoria_inicial = memoria_processo_mb()
+            inicio = time.perf_counter()
+            bloco = next(blocos, None)
+            if bloco is None:
+                self.registrar(nome, time.perf_counter() - inicio, memoria_delta_mb=_delta_memoria(memoria_inicial),
+                               execucoes=0)
+                return
+            self.registrar(nome, time.perf_counter() - inicio, len(bloco), len(bloco),
+                           memoria_delta_mb=_delta_memoria(memoria_inicial))
+            yield bloco
+
+    def medir_consumo(self, blocos, nome):
+        """Repassa os blocos contando como `nome` o tempo que quem os consome leva com cada um."""
+        for bloco in blocos:
+            memoria_inicial = memoria_processo_mb()
+            inicio = time.perf_counter()
+            yield bloco
+            self.registrar(nome, time.perf_counter() - inicio, len(bloco), len(bloco),
+                           memoria_delta_mb=_delta_memoria(memoria_inicial))
+
+    def mesclar(self, etapas):
+        """Soma as métricas vindas de outro processo (modo paralelo)."""
+        for metrica in etapas.values():
+            self.registrar(**asdict(metrica))
+
+    def tabela(self):
+        colunas = list(MetricaEtapa.__dataclass_fields__)
+        return pd.DataFrame([asdict(m) for m in self.etapas.values()], columns=colunas).set_index('etapa')
+
+    def emitir_logs(self, **contexto):
+        """Uma linha JSON por etapa no logger `src.logic.instrumentacao`, com os campos extras de `contexto`."""
+        for metrica in self.etapas.values():
+            registro = {'evento': 'etapa_limpeza', **contexto, **asdict(metrica)}
+            logger.info(json.dumps(registro, ensure_ascii=False, default=str), extra={'metricas': registro})
+
+    def resumo(self):
+        return '\n'.join(
+            f"  {m.etapa:<32} {m.segundos:>8.3f}s  {m.linhas_entrada:>9} -> {m.linhas_saida:<9} "
+            f"descartadas {m.linhas_rejeitadas:<7} memória {m.memoria_delta_mb:+.1f} MB"
+            for m in self.etapas.values()
+        )
+
+def contar_descartados(antes, depois):
+    """Células que tinham valor antes da etapa e ficaram vazias depois dela."""
+    preenchidas_antes = antes.notna().to_numpy() & antes.astype(object).ne('').to_numpy()
+    vazias_depois = depois.isna().to_numpy() | depois.astype(object).eq('').to_numpy()
+    return int((preenchidas_antes & vazias_depois).sum())
+
+@dataclass
+class ResultadoPerfil:
+    modo: str
+    texto: str = ''
+    arquivo: str = None
+
+@contextmanager
+def perfilar(modo=None, arquivo=None):
+    """Perfila o bloco `with` com cProfile ou pyinstrument; com `modo` None não faz nada.
+
+    O relatório em texto fica em `.texto` ao sair do bloco; com `arquivo`, grava também o perfil completo
+    (.prof do cProfile, legível no snakeviz, ou HTML do pyinstrument).
+    """
+    if modo is None:
+        yield None
+        return
+    if modo not in MODOS_PERFIL:
+        raise ValueError(f"Modo de perfilamento desconhecido: {modo}")
+    resultado = ResultadoPerfil(modo, arquivo=arquivo)
+    if modo == 'cprofile':
+        perfilador = cProfile.Profile()
+        perfilador.enable()
+        try:
+            yield resultado
+        finally:
+            perfilador.disable()
+            saida = io.StringIO()
+            pstats.Stats(perfilador, stream=saida).sort_stats('cumulative').print_stats(LINHAS_RELATORIO_CPROFILE)
+            resultado.texto = saida.getvalue()
+            if arquivo:
+                perfilador.dump_stats(arquivo)
+        return
+
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        raise ImportError("O perfilamento com pyinstrument requer o pacote pyinstrument (pip install pyinstrument).")
+    perfilador = Profiler()
+    perfilador.start()
+    try:
+        yield resultado
+    finally:
+        perfilador.stop()
+        resultado.texto = perfilador.output_text(unicode=True)
+        if arquivo:
+            with open(arquivo, 'w', encoding='utf-8') as saida:
+                saida.write(perfilador.output_html())
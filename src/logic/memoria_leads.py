@@ -0,0 +1,239 @@
+# Arquivo: src/logic/memoria_leads.py
+# Memória de leads já processados (SQLite local) para não recontatar as mesmas pessoas em arquivos diferentes.
+import os
+import re
+import sqlite3
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.logic.ingestao import TIPO_TEXTO
+from src.logic.regras import carregar_regras
+
+CAMINHO_MEMORIA_PADRAO = os.path.join(os.path.expanduser('~'), '.agente_ldr', 'memoria_leads.sqlite3')
+# Permite apontar a memória para outro arquivo (ex.: uma pasta compartilhada pela equipe).
+VARIAVEL_AMBIENTE_MEMORIA = 'AGENTE_LDR_MEMORIA'
+
+# Chave de deduplicação -> coluna limpa de onde ela é extraída.
+CHAVES_DEDUPLICACAO = {'email': 'Email_Lead', 'telefone': 'Telefone_Original', 'dominio': 'Site_Original'}
+CHAVES_PADRAO = ('email', 'telefone')
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    id INTEGER PRIMARY KEY,
+    email TEXT,
+    telefone TEXT,
+    dominio TEXT,
+    nome_completo TEXT,
+    nome_empresa TEXT,
+    origem TEXT,
+    ingerido_em TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_leads_email ON leads (email) WHERE email IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_leads_telefone ON leads (telefone) WHERE telefone IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_leads_dominio ON leads (dominio) WHERE dominio IS NOT NULL;
+"""
+
+def _texto(serie):
+    # Coluna como texto sem espaços nas pontas; category, NaN e NA chegam todos iguais.
+    return serie.astype(object).astype(TIPO_TEXTO).str.strip()
+
+def _sem_vazios(texto):
+    # De volta a object, com None nos vazios: o formato que o sqlite3 e o factorize esperam.
+    return texto.astype(object).where(texto.fillna('').str.len() > 0, None)
+
+def dominios_dos_sites(sites, regras=None):
+    """Domínio (minúsculo, sem "www." nem caminho) de cada site já padronizado; None quando vazio."""
+    regras = regras or carregar_regras()
+    # padronizar_site devolve "www.dominio/caminho": o prefixo e o caminho não fazem parte do domínio.
+    dominio = _texto(sites).str.lower()
+    dominio = dominio.str.replace(f'^{re.escape(regras.prefixo_site.lower())}', '', regex=True)
+    return _sem_vazios(dominio.str.replace('/.*', '', regex=True))
+
+def chaves_dos_leads(df, regras=None):
+    """Chaves normalizadas de cada lead limpo: e-mail em minúsculas, só os dígitos do telefone e o domínio do site."""
+    vazia = pd.Series(None, index=df.index, dtype=object)
+    colunas = {chave: df[col] if col in df.columns else vazia for chave, col in CHAVES_DEDUPLICACAO.items()}
+    email = _texto(colunas['email']).str.lower()
+    chaves = pd.DataFrame(index=df.index)
+    chaves['email'] = _sem_vazios(email.where(email.str.contains('@', regex=False).fillna(False), ''))
+    chaves['telefone'] = _sem_vazios(_texto(colunas['telefone']).str.replace(r'\D', '', regex=True))
+    chaves['dominio'] = dominios_dos_sites(colunas['dominio'], regras)
+    return chaves
+
+def validar_chaves(chaves):
+    chaves = tuple(chaves)
+    desconhecidas = [c for c in chaves if c not in CHAVES_DEDUPLICACAO]
+    if desconhecidas or not chaves:
+        raise ValueError(f"Chaves de deduplicação inválidas: {desconhecidas or chaves}; "
+                         f"use {', '.join(CHAVES_DEDUPLICACAO)}.")
+    return chaves
+
+def repetidos_no_proprio_lote(chaves_df, chaves):
+    """Linhas que repetem alguma chave de uma linha anterior do mesmo lote (a primeira ocorrência fica)."""
+    repetidos = np.zeros(len(chaves_df), dtype=bool)
+    for chave in chaves:
+        coluna = chaves_df[chave]
+        repetidos |= (coluna.notna() & coluna.duplicated()).to_numpy()
+    return repetidos
+
+@dataclass
+class ChavesDaExecucao:
+    """Chaves já vistas nos lotes anteriores de uma mesma execução (ex.: blocos de um arquivo lido em partes).
+
+    Com elas, um lead repetido entre blocos é classificado como no arquivo inteiro: repetido no próprio arquivo,
+    e não "já conhecido" só porque o bloco anterior o gravou na memória.
+    """
+    # Chave -> valores de todas as linhas já vistas / só dos leads novos gravados na memória nesta execução.
+    vistas: dict = field(default_factory=dict)
+    gravadas: dict = field(default_factory=dict)
+
+    def repetidas(self, chaves_df, chaves):
+        """Linhas com alguma chave já vista num lote anterior ou numa linha anterior do próprio lote."""
+        repetidos = repetidos_no_proprio_lote(chaves_df, chaves)
+        for chave in chaves:
+            if self.vistas.get(chave):
+                repetidos |= chaves_df[chave].isin(self.vistas[chave]).to_numpy()
+        return repetidos
+
+    def sem_gravadas(self, chaves_df, chaves):
+        # Os valores gravados nesta execução não estavam na memória antes dela: não contam como "já conhecidos".
+        chaves_df = chaves_df.copy()
+        for chave in chaves:
+            if self.gravadas.get(chave):
+                coluna = chaves_df[chave]
+                chaves_df[chave] = coluna.where(~coluna.isin(self.gravadas[chave]), None)
+        return chaves_df
+
+    def acrescentar(self, chaves_df, chaves, gravados):
+        for chave in chaves:
+            coluna = chaves_df[chave]
+            self.vistas.setdefault(chave, set()).update(coluna.dropna())
+            if gravados is not None:
+                self.gravadas.setdefault(chave, set()).update(coluna[gravados].dropna())
+
+class MemoriaLeads:
+    """Leads já processados, guardados num SQLite com índices por e-mail, telefone e domínio.
+
+    As consultas são feitas por lote: as chaves do arquivo novo vão para uma tabela temporária e um único
+    SELECT com EXISTS sobre os índices devolve as linhas já conhecidas, sem uma consulta por linha.
+    """
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho or os.environ.get(VARIAVEL_AMBIENTE_MEMORIA) or CAMINHO_MEMORIA_PADRAO
+        diretorio = os.path.dirname(os.path.abspath(self.caminho))
+        os.makedirs(diretorio, exist_ok=True)
+        with self._conectar() as conexao:
+            conexao.executescript(ESQUEMA)
+
+    @contextmanager
+    def _conectar(self):
+        # Uma conexão por operação: a memória pode ser usada por várias sessões (threads) do Streamlit.
+        with closing(sqlite3.connect(self.caminho, timeout=30)) as conexao:
+            conexao.execute('PRAGMA journal_mode=WAL')
+            conexao.execute('PRAGMA synchronous=NORMAL')
+            with conexao:
+                yield conexao
+
+    def __len__(self):
+        with self._conectar() as conexao:
+            return conexao.execute('SELECT COUNT(*) FROM leads').fetchone()[0]
+
+    def _marcar_conhecidos(self, conexao, chaves_df, chaves):
+        conexao.execute('CREATE TEMP TABLE IF NOT EXISTS consulta '
+                        '(linha INTEGER PRIMARY KEY, email TEXT, telefone TEXT, dominio TEXT)')
+        conexao.execute('DELETE FROM consulta')
+        linhas = zip(range(len(chaves_df)), *(chaves_df[c].tolist() for c in CHAVES_DEDUPLICACAO))
+        conexao.executemany('INSERT INTO consulta VALUES (?, ?, ?, ?)', linhas)
+        condicoes = ' OR '.join(
+            f'(c.{c} IS NOT NULL AND EXISTS (SELECT 1 FROM leads l WHERE l.{c} = c.{c}))' for c in chaves
+        )
+        conhecidos = np.zeros(len(chaves_df), dtype=bool)
+        indices = [linha for (linha,) in conexao.execute(f'SELECT c.linha FROM consulta c WHERE {condicoes}')]
+        conhecidos[indices] = True
+        conexao.execute('DELETE FROM consulta')
+        return conhecidos
+
+    def _inserir(self, conexao, df, chaves_df, origem):
+        ingerido_em = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        vazia = pd.Series(None, index=df.index, dtype=object)
+        nomes = _sem_vazios(_texto(df['Nome_Completo'])) if 'Nome_Completo' in df.columns else vazia
+        empresas = _sem_vazios(_texto(df['Nome_Empresa'])) if 'Nome_Empresa' in df.columns else vazia
+        linhas = zip(*(chaves_df[c].tolist() for c in CHAVES_DEDUPLICACAO), nomes.tolist(), empresas.tolist())
+        conexao.executemany(
+            'INSERT INTO leads (email, telefone, dominio, nome_completo, nome_empresa, origem, ingerido_em) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            ((*linha, origem, ingerido_em) for linha in linhas)
+        )
+
+    def conhecidos(self, df, chaves=CHAVES_PADRAO):
+        """Máscara (numpy) das linhas de `df` com alguma das `chaves` já presente na memória."""
+        chaves = validar_chaves(chaves)
+        chaves_df = chaves_dos_leads(df)
+        with self._conectar() as conexao:
+            return self._marcar_conhecidos(conexao, chaves_df, chaves)
+
+    def registrar(self, df, origem=''):
+        """Guarda os leads de `df` (sem checar duplicidade). Retorna quantos foram gravados."""
+        with self._conectar() as conexao:
+            self._inserir(conexao, df, chaves_dos_leads(df), origem)
+        return len(df)
+
+    def filtrar_novos(self, df, chaves=CHAVES_PADRAO, origem='', registrar=True, execucao=None):
+        """Remove de `df` os leads já conhecidos e os repetidos no próprio lote; com `registrar`, guarda os novos.
+
+        Retorna (DataFrame só com os novos, quantidade já conhecida, quantidade repetida no lote).
+        A checagem e a gravação acontecem na mesma transação. Com `execucao` (ChavesDaExecucao), os lotes
+        anteriores da mesma execução contam como parte do lote.
+        """
+        chaves = validar_chaves(chaves)
+        chaves_df = chaves_dos_leads(df)
+        execucao = execucao if execucao is not None else ChavesDaExecucao()
+        with self._conectar() as conexao:
+            conhecidos = self._marcar_conhecidos(conexao, execucao.sem_gravadas(chaves_df, chaves), chaves)
+            repetidos = ~conhecidos & execucao.repetidas(chaves_df, chaves)
+            novos = ~(conhecidos | repetidos)
+            if registrar and novos.any():
+                self._inserir(conexao, df[novos], chaves_df[novos], origem)
+        execucao.acrescentar(chaves_df, chaves, novos if registrar else None)
+        return df[novos], int(conhecidos.sum()), int(repetidos.sum())
+
+@dataclass
+class DeduplicacaoMemoria:
+    """Deduplicação contra a memória aplicada a cada bloco limpo, com as contagens acumuladas.
+
+    As chaves vistas ficam guardadas entre os blocos: o resultado e as contagens não dependem do tamanho do bloco.
+    """
+    memoria: MemoriaLeads
+    chaves: tuple = CHAVES_PADRAO
+    origem: str = ''
+    registrar: bool = True
+    linhas_recebidas: int = 0
+    conhecidos: int = 0
+    repetidos_no_arquivo: int = 0
+    novos: int = 0
+    guardados: int = 0
+    execucao: ChavesDaExecucao = field(default_factory=ChavesDaExecucao)
+
+    def aplicar(self, bloco):
+        novos, conhecidos, repetidos = self.memoria.filtrar_novos(bloco, self.chaves, self.origem, self.registrar,
+                                                                  self.execucao)
+        self.linhas_recebidas += len(bloco)
+        self.conhecidos += conhecidos
+        self.repetidos_no_arquivo += repetidos
+        self.novos += len(novos)
+        if self.registrar:
+            self.guardados += len(novos)
+        return novos
+
+    def guardar(self, leads):
+        """Guarda `leads` depois de uma etapa posterior (ex.: só os escolhidos por empresa), com `registrar` desligado."""
+        self.guardados += self.memoria.registrar(leads, self.origem)
+
+    def resumo(self):
+        return (f"{self.linhas_recebidas} leads verificados por {', '.join(self.chaves)}: "
+                f"{self.conhecidos} já conhecidos, {self.repetidos_no_arquivo} repetidos no próprio arquivo, "
+                f"{self.novos} novos; {self.guardados} guardados na memória")
@@ -0,0 +1,389 @@
+# Arquivo: src/logic/pipeline.py
+# Pipeline de limpeza reutilizável fora do Streamlit, processando o CSV em blocos de linhas.
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from src.logic.data_cleaning import (
+    CacheLRU,
+    aplicar_por_valores_unicos,
+    padronizar_nomes_contato,
+    padronizar_nomes_empresa,
+    padronizar_localidade_geral,
+    padronizar_cidade,
+    padronizar_sites,
+    padronizar_telefones,
+    padronizar_segmento,
+    padronizar_numero_funcionarios
+)
+from src.logic.exportacao import FORMATOS_EXPORTACAO, gravar_blocos
+from src.logic.ibge import carregar_indice_ibge
+from src.logic.ingestao import TIPO_TEXTO, RelatorioIngestao, ler_csv, ler_csv_em_blocos
+from src.logic.instrumentacao import MODOS_PERFIL, Instrumentacao, contar_descartados, perfilar
+from src.logic.memoria_leads import CHAVES_DEDUPLICACAO, CHAVES_PADRAO, DeduplicacaoMemoria, MemoriaLeads
+from src.logic.regras import carregar_regras
+from src.logic.similaridade import LIMIAR_PADRAO, RelatorioCorrecoes, corrigir_cidades, corrigir_segmentos
+
+MAPA_COLUNAS = {
+    'First Name': 'Nome_Lead', 'Last Name': 'Sobrenome_Lead', 'Title': 'Cargo',
+    'Company': 'Nome_Empresa', 'Email': 'Email_Lead', 'Corporate Phone': 'Telefone_Original',
+    'Industry': 'Segmento_Original', 'City': 'Cidade_Contato', 'State': 'Estado_Contato',
+    'Country': 'Pais_Contato', 'Company City': 'Cidade_Empresa', 'Company State': 'Estado_Empresa',
+    'Company Country': 'Pais_Empresa', 'Website': 'Site_Original', '# Employees': 'Numero_Funcionarios',
+    'Person Linkedin Url': 'Linkedin_Contato', 'Company Linkedin Url': 'LinkedIn_Empresa',
+    'Facebook Url': 'Facebook_Empresa'
+}
+
+ORDEM_FINAL_DESEJADA = [
+    'Nome_Completo', 'Cargo', 'Email_Lead', 'Nome_Empresa', 'Site_Original',
+    'Telefone_Original', 'Cidade_Contato', 'Estado_Contato', 'Pais_Contato',
+    'Segmento_Original', 'Cidade_Empresa', 'Estado_Empresa', 'Pais_Empresa',
+    'Numero_Funcionarios', 'Linkedin_Contato', 'LinkedIn_Empresa', 'Facebook_Empresa'
+]
+
+TAMANHO_BLOCO_PADRAO = 50_000
+
+# Colunas com poucos valores distintos em relação ao número de linhas: guardadas como category.
+COLUNAS_CATEGORICAS = {
+    'Cidade_Contato', 'Estado_Contato', 'Pais_Contato', 'Segmento_Original',
+    'Cidade_Empresa', 'Estado_Empresa', 'Pais_Empresa', 'Numero_Funcionarios'
+}
+
+def _corrigir_por_similaridade(df_limpo, indice, limiar, correcoes, instrumentacao):
+    # Correção opcional de erros de digitação, antes da padronização exata (que passa a reconhecer o valor).
+    for col_cidade, col_estado in [('Cidade_Contato', 'Estado_Contato'), ('Cidade_Empresa', 'Estado_Empresa')]:
+        if col_cidade in df_limpo.columns:
+            estados = df_limpo[col_estado] if col_estado in df_limpo.columns else pd.Series(None, index=df_limpo.index)
+            with instrumentacao.etapa(f'similaridade:{col_cidade}', len(df_limpo)):
+                df_limpo[col_cidade] = corrigir_cidades(df_limpo[col_cidade], estados, indice, limiar, correcoes,
+                                                        col_cidade)
+    if 'Segmento_Original' in df_limpo.columns:
+        with instrumentacao.etapa('similaridade:Segmento_Original', len(df_limpo)):
+            df_limpo['Segmento_Original'] = corrigir_segmentos(df_limpo['Segmento_Original'], limiar, correcoes,
+                                                               'Segmento_Original')
+
+def limpar_dataframe(df, indice, cache=None, instrumentacao=None, regras=None, limiar_similaridade=None,
+                     correcoes=None):
+    """Limpa um DataFrame exportado do Apollo.
+
+    Com `limiar_similaridade` (0 a 1), cidades e segmentos fora das listas conhecidas são trocados pelo valor
+    mais parecido acima do limiar, e cada troca é anotada em `correcoes` (RelatorioCorrecoes).
+    """
+    instrumentacao = instrumentacao if instrumentacao is not None else Instrumentacao()
+    regras = regras or carregar_regras()
+    colunas_para_renomear = {k: v for k, v in MAPA_COLUNAS.items() if k in df.columns}
+    df_limpo = df.rename(columns=colunas_para_renomear)
+
+    colunas_finais = list(colunas_para_renomear.values())
+    df_limpo = df_limpo[[col for col in colunas_finais if col in df_limpo.columns]].copy()
+
+    if 'Nome_Lead' in df_limpo.columns and 'Sobrenome_Lead' in df_limpo.columns:
+        with instrumentacao.etapa('limpeza:Nome_Completo', len(df_limpo)):
+            df_limpo['Nome_Completo'] = padronizar_nomes_contato(df_limpo, cache)
+            df_limpo = df_limpo.drop(columns=['Nome_Lead', 'Sobrenome_Lead'])
+
+    if limiar_similaridade is not None:
+        _corrigir_por_similaridade(df_limpo, indice, limiar_similaridade, correcoes, instrumentacao)
+
+    mapa_cidades, mapa_estados = indice.mapa_cidades, indice.mapa_estados
+    # Cidades primeiro: a UF usada para desempatar homônimos vem da coluna de estado ainda original.
+    for col_cidade, col_estado in [('Cidade_Contato', 'Estado_Contato'), ('Cidade_Empresa', 'Estado_Empresa')]:
+        if col_cidade in df_limpo.columns:
+            estados = df_limpo[col_estado] if col_estado in df_limpo.columns else [None] * len(df_limpo)
+            with instrumentacao.etapa(f'limpeza:{col_cidade}', len(df_limpo)) as medicao:
+                original = df_limpo[col_cidade]
+                df_limpo[col_cidade] = aplicar_por_valores_unicos(
+                    lambda cidade, estado: padronizar_cidade(cidade, estado, indice),
+                    original, pd.Series(estados, index=df_limpo.index),
+                    cache=cache, nome=('cidade', indice.versao)
+                )
+                medicao.linhas_rejeitadas = contar_descartados(original, df_limpo[col_cidade])
+
+    estado = lambda x: padronizar_localidade_geral(x, 'estado', mapa_cidades, mapa_estados)
+    pais = lambda x: padronizar_localidade_geral(x, 'pais', mapa_cidades, mapa_estados)
+    # (função, nome da transformação no cache); colunas equivalentes compartilham o mesmo nome.
+    colunas_para_padronizar = {
+        'Segmento_Original': (padronizar_segmento, 'segmento'),
+        'Numero_Funcionarios': (padronizar_numero_funcionarios, 'numero_funcionarios'),
+        'Estado_Contato': (estado, ('estado', indice.versao)),
+        'Pais_Contato': (pais, 'pais'),
+        'Estado_Empresa': (estado, ('estado', indice.versao)),
+        'Pais_Empresa': (pais, 'pais'),
+    }
+
+    # Colunas de baixa cardinalidade: cada valor distinto é transformado uma única vez.
+    for col, (func, nome) in colunas_para_padronizar.items():
+        if col in df_limpo.columns:
+            with instrumentacao.etapa(f'limpeza:{col}', len(df_limpo)) as medicao:
+                original = df_limpo[col]
+                df_limpo[col] = aplicar_por_valores_unicos(func, original, cache=cache, nome=nome)
+                medicao.linhas_rejeitadas = contar_descartados(original, df_limpo[col])
+
+    # Colunas padronizadas por coluna inteira (vetorizado), não célula a célula.
+    colunas_vetorizadas = {
+        'Nome_Empresa': lambda serie: padronizar_nomes_empresa(serie, regras, cache),
+        'Site_Original': lambda serie: padronizar_sites(serie, regras),
+        'Telefone_Original': padronizar_telefones,
+    }
+    for col, func in colunas_vetorizadas.items():
+        if col in df_limpo.columns:
+            with instrumentacao.etapa(f'limpeza:{col}', len(df_limpo)) as medicao:
+                original = df_limpo[col]
+                df_limpo[col] = func(original)
+                medicao.linhas_rejeitadas = contar_descartados(original, df_limpo[col])
+
+    with instrumentacao.etapa('ordenacao_colunas', len(df_limpo)):
+        colunas_existentes_na_ordem = [col for col in ORDEM_FINAL_DESEJADA if col in df_limpo.columns]
+        outras_colunas = [col for col in df_limpo.columns if col not in colunas_existentes_na_ordem]
+        # Valores ausentes seguem como NaN (o CSV os grava vazios); compactar_dataframe os converte para NA.
+        df_limpo = df_limpo[colunas_existentes_na_ordem + outras_colunas]
+    return df_limpo
+
+def compactar_dataframe(df):
+    """Representação enxuta para manter em memória: colunas repetitivas como category, texto livre como string."""
+    compacto = {}
+    for col in df.columns:
+        serie = df[col].mask(df[col] == '')
+        compacto[col] = serie.astype('category') if col in COLUNAS_CATEGORICAS else serie.astype(TIPO_TEXTO)
+    return pd.DataFrame(compacto, index=df.index)
+
+def relatorio_memoria(antes, depois):
+    """Memória por coluna (MB) antes e depois da compactação, com uma linha de total."""
+    relatorio = pd.DataFrame({
+        'antes_mb': antes.memory_usage(deep=True, index=False) / 1_000_000,
+        'depois_mb': depois.memory_usage(deep=True, index=False) / 1_000_000,
+    })
+    relatorio.loc['Total'] = relatorio.sum()
+    relatorio['reducao'] = 1 - relatorio['depois_mb'] / relatorio['antes_mb']
+    return relatorio
+
+# Estado de cada processo trabalhador: o índice do IBGE chega uma única vez, pelo inicializador,
+# e não a cada bloco. DICIONARIO_SEGMENTOS já é importado pelo próprio módulo no trabalhador.
+_INDICE_TRABALHADOR = None
+_CACHE_TRABALHADOR = None
+_LIMIAR_TRABALHADOR = None
+
+def _inicializar_trabalhador(indice, limiar_similaridade=None):
+    global _INDICE_TRABALHADOR, _CACHE_TRABALHADOR, _LIMIAR_TRABALHADOR
+    _INDICE_TRABALHADOR = indice
+    _CACHE_TRABALHADOR = CacheLRU()
+    _LIMIAR_TRABALHADOR = limiar_similaridade
+
+def _limpar_bloco_no_trabalhador(bloco):
+    # As métricas e as correções de cada bloco voltam junto com ele e são somadas no processo principal.
+    instrumentacao, correcoes = Instrumentacao(), RelatorioCorrecoes()
+    bloco_limpo = limpar_dataframe(bloco, _INDICE_TRABALHADOR, _CACHE_TRABALHADOR, instrumentacao,
+                                   limiar_similaridade=_LIMIAR_TRABALHADOR, correcoes=correcoes)
+    return bloco_limpo, instrumentacao.etapas, correcoes.correcoes
+
+def _limpar_blocos_em_paralelo(blocos, indice, trabalhadores, instrumentacao=None, limiar_similaridade=None,
+                               correcoes=None):
+    # 'spawn' evita herdar por fork as threads do servidor do Streamlit.
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=trabalhadores, mp_context=contexto,
+                             initializer=_inicializar_trabalhador, initargs=(indice, limiar_similaridade)) as executor:
+        # Poucos blocos em voo por vez: a ordem original é mantida e a memória continua limitada.
+        pendentes = deque()
+
+        def proximo_resultado():
+            bloco_limpo, etapas, correcoes_bloco = pendentes.popleft().result()
+            if instrumentacao is not None:
+                instrumentacao.mesclar(etapas)
+            if correcoes is not None:
+                correcoes.mesclar(correcoes_bloco)
+            return bloco_limpo
+
+        for bloco in blocos:
+            pendentes.append(executor.submit(_limpar_bloco_no_trabalhador, bloco))
+            if len(pendentes) >= 2 * trabalhadores:
+                yield proximo_resultado()
+        while pendentes:
+            yield proximo_resultado()
+
+def remover_leads_conhecidos(bloco_limpo, deduplicacao, instrumentacao=None):
+    """Aplica a deduplicação contra a memória de leads (DeduplicacaoMemoria) a um bloco já limpo."""
+    # Roda no processo principal, na ordem dos blocos: a DeduplicacaoMemoria guarda as chaves vistas nos blocos
+    # anteriores, e um lead repetido entre blocos é descartado como no arquivo inteiro.
+    if deduplicacao is None:
+        return bloco_limpo
+    instrumentacao = instrumentacao if instrumentacao is not None else Instrumentacao()
+    with instrumentacao.etapa('memoria_leads', len(bloco_limpo)) as medicao:
+        bloco_novo = deduplicacao.aplicar(bloco_limpo)
+        medicao.linhas_saida = len(bloco_novo)
+        medicao.linhas_rejeitadas = len(bloco_limpo) - len(bloco_novo)
+    return bloco_novo
+
+def resolver_trabalhadores(trabalhadores):
+    """0 ou None usa todos os núcleos disponíveis."""
+    return trabalhadores if trabalhadores else (os.cpu_count() or 1)
+
+def limpar_dataframe_em_paralelo(df, indice, trabalhadores=None, instrumentacao=None, limiar_similaridade=None,
+                                 correcoes=None):
+    """Divide o DataFrame entre processos e remonta o resultado na ordem original das linhas."""
+    trabalhadores = resolver_trabalhadores(trabalhadores)
+    if trabalhadores <= 1 or len(df) == 0:
+        return limpar_dataframe(df, indice, instrumentacao=instrumentacao, limiar_similaridade=limiar_similaridade,
+                                correcoes=correcoes)
+    tamanho_particao = -(-len(df) // trabalhadores)
+    particoes = (df.iloc[i:i + tamanho_particao] for i in range(0, len(df), tamanho_particao))
+    return pd.concat(list(_limpar_blocos_em_paralelo(
+        particoes, indice, trabalhadores, instrumentacao, limiar_similaridade, correcoes)))
+
+def limpar_em_blocos(entrada, indice, tamanho_bloco=TAMANHO_BLOCO_PADRAO, cache=None, trabalhadores=1,
+                     relatorio=None, instrumentacao=None, limiar_similaridade=None, correcoes=None,
+                     deduplicacao=None):
+    """Gera os blocos já limpos, um por vez, mantendo o uso de memória constante.
+
+    Com `trabalhadores` > 1 os blocos são limpos em paralelo (cada processo usa o próprio cache e
+    `cache` é ignorado); a saída é idêntica à do modo serial. Com `deduplicacao` (DeduplicacaoMemoria),
+    os leads já presentes na memória de leads são removidos de cada bloco.
+    """
+    relatorio = relatorio if relatorio is not None else RelatorioIngestao()
+    descartadas_antes = relatorio.linhas_descartadas
+    blocos = ler_csv_em_blocos(entrada, tamanho_bloco, colunas=MAPA_COLUNAS, relatorio=relatorio)
+    if instrumentacao is not None:
+        blocos = instrumentacao.medir_iteracao(blocos, 'leitura')
+    if resolver_trabalhadores(trabalhadores) > 1:
+        blocos_limpos = _limpar_blocos_em_paralelo(blocos, indice, resolver_trabalhadores(trabalhadores),
+                                                   instrumentacao, limiar_similaridade, correcoes)
+    else:
+        blocos_limpos = (limpar_dataframe(bloco, indice, cache, instrumentacao,
+                                          limiar_similaridade=limiar_similaridade, correcoes=correcoes)
+                         for bloco in blocos)
+    for bloco_limpo in blocos_limpos:
+        yield remover_leads_conhecidos(bloco_limpo, deduplicacao, instrumentacao)
+    if instrumentacao is not None:
+        descartadas = relatorio.linhas_descartadas - descartadas_antes
+        instrumentacao.registrar('leitura', linhas_entrada=descartadas, linhas_rejeitadas=descartadas, execucoes=0)
+
+def _ler_arquivo_inteiro(entrada, relatorio, instrumentacao):
+    relatorio = relatorio if relatorio is not None else RelatorioIngestao()
+    descartadas_antes = relatorio.linhas_descartadas
+    with instrumentacao.etapa('leitura') as medicao:
+        df = ler_csv(entrada, colunas=MAPA_COLUNAS, relatorio=relatorio)
+        medicao.linhas_rejeitadas = relatorio.linhas_descartadas - descartadas_antes
+        medicao.linhas_entrada, medicao.linhas_saida = len(df) + medicao.linhas_rejeitadas, len(df)
+    return df
+
+def limpar_arquivo(entrada, indice, tamanho_bloco=None, cache=None, trabalhadores=1, relatorio=None,
+                   compactar=True, instrumentacao=None, limiar_similaridade=None, correcoes=None, deduplicacao=None):
+    """Limpa o arquivo inteiro e devolve um único DataFrame (uso interativo), compactado por padrão.
+
+    Sem `tamanho_bloco` o arquivo é lido de uma só vez (motor pyarrow quando disponível). Com `instrumentacao`,
+    cada etapa registra tempo, linhas e memória; no modo paralelo os tempos são somados entre os processos.
+    """
+    instrumentacao = instrumentacao if instrumentacao is not None else Instrumentacao()
+    if tamanho_bloco is None:
+        df = _ler_arquivo_inteiro(entrada, relatorio, instrumentacao)
+        if resolver_trabalhadores(trabalhadores) > 1:
+            df_limpo = limpar_dataframe_em_paralelo(df, indice, trabalhadores, instrumentacao,
+                                                    limiar_similaridade, correcoes)
+        else:
+            df_limpo = limpar_dataframe(df, indice, cache, instrumentacao, limiar_similaridade=limiar_similaridade,
+                                        correcoes=correcoes)
+        df_limpo = remover_leads_conhecidos(df_limpo, deduplicacao, instrumentacao)
+    else:
+        blocos = list(limpar_em_blocos(entrada, indice, tamanho_bloco, cache, trabalhadores, relatorio,
+                                       instrumentacao, limiar_similaridade, correcoes, deduplicacao))
+        df_limpo = pd.concat(blocos, ignore_index=True)
+    if not compactar:
+        return df_limpo
+    with instrumentacao.etapa('compactacao', len(df_limpo)):
+        return compactar_dataframe(df_limpo)
+
+def limpar_e_exportar(entrada, saida, indice, formato='csv', tamanho_bloco=TAMANHO_BLOCO_PADRAO, cache=None,
+                      trabalhadores=1, relatorio=None, instrumentacao=None, limiar_similaridade=None, correcoes=None,
+                      deduplicacao=None):
+    """Limpa `entrada` e grava o resultado em `saida` (csv, parquet ou arrow) de forma incremental.
+
+    Retorna o total de linhas gravadas.
+    """
+    blocos = limpar_em_blocos(entrada, indice, tamanho_bloco, cache, trabalhadores, relatorio, instrumentacao,
+                              limiar_similaridade, correcoes, deduplicacao)
+    if instrumentacao is not None:
+        blocos = instrumentacao.medir_consumo(blocos, 'exportacao')
+    return gravar_blocos(blocos, saida, formato)
+
+def limpar_csv(entrada, saida, indice, tamanho_bloco=TAMANHO_BLOCO_PADRAO, cache=None, trabalhadores=1,
+               relatorio=None, instrumentacao=None, limiar_similaridade=None, correcoes=None, deduplicacao=None):
+    """Limpa `entrada` e grava o resultado em `saida` de forma incremental. Retorna o total de linhas."""
+    return limpar_e_exportar(entrada, saida, indice, 'csv', tamanho_bloco, cache, trabalhadores, relatorio,
+                             instrumentacao, limiar_similaridade, correcoes, deduplicacao)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Limpa e padroniza um CSV de leads (Apollo ou similar).")
+    parser.add_argument('entrada', help="CSV bruto de entrada.")
+    parser.add_argument('saida', help="Arquivo limpo de saída (CSV com separador ';' e UTF-8 com BOM, por padrão).")
+    parser.add_argument('--formato', choices=list(FORMATOS_EXPORTACAO), default='csv',
+                        help="Formato do arquivo de saída (padrão: csv).")
+    parser.add_argument('--atualizar-ibge', action='store_true',
+                        help="Baixa novamente as localidades do IBGE em vez de usar o snapshot local.")
+    parser.add_argument('--trabalhadores', type=int, default=1,
+                        help="Processos paralelos para limpar os blocos (0 = todos os núcleos; padrão: 1).")
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO_PADRAO,
+                        help=f"Linhas processadas por bloco (padrão: {TAMANHO_BLOCO_PADRAO}).")
+    parser.add_argument('--perfil', choices=MODOS_PERFIL,
+                        help="Perfila a execução com cProfile ou pyinstrument e imprime o relatório.")
+    parser.add_argument('--arquivo-perfil', help="Grava o perfil completo (.prof do cProfile ou HTML do pyinstrument).")
+    parser.add_argument('--log-metricas', action='store_true',
+                        help="Emite as métricas de cada etapa como logs JSON na saída de erro.")
+    parser.add_argument('--corrigir-aproximado', type=float, nargs='?', const=LIMIAR_PADRAO, metavar='LIMIAR',
+                        help="Corrige erros de digitação em cidades e segmentos pelo valor mais parecido "
+                             f"(confiança mínima de 0 a 1; padrão: {LIMIAR_PADRAO}).")
+    parser.add_argument('--memoria-leads', nargs='?', const='', metavar='CAMINHO',
+                        help="Remove os leads já processados em arquivos anteriores e guarda os novos na memória de "
+                             "leads (SQLite; padrão: variável AGENTE_LDR_MEMORIA ou ~/.agente_ldr).")
+    parser.add_argument('--chaves-duplicidade', nargs='+', choices=list(CHAVES_DEDUPLICACAO), default=CHAVES_PADRAO,
+                        help=f"Chaves que identificam um lead repetido (padrão: {' '.join(CHAVES_PADRAO)}).")
+    parser.add_argument('--nao-registrar', action='store_true',
+                        help="Com --memoria-leads, apenas remove os conhecidos, sem guardar os novos.")
+    args = parser.parse_args(argv)
+
+    if args.log_metricas:
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    instrumentacao = Instrumentacao()
+    with instrumentacao.etapa('ibge'):
+        indice = carregar_indice_ibge(atualizar=args.atualizar_ibge)
+    if indice.origem == 'embutido':
+        print("Aviso: sem snapshot nem acesso ao IBGE; apenas estados serão padronizados pelo índice.", file=sys.stderr)
+
+    cache = CacheLRU()
+    relatorio = RelatorioIngestao()
+    correcoes = RelatorioCorrecoes()
+    deduplicacao = None
+    if args.memoria_leads is not None:
+        deduplicacao = DeduplicacaoMemoria(MemoriaLeads(args.memoria_leads or None), tuple(args.chaves_duplicidade),
+                                           os.path.basename(args.entrada), not args.nao_registrar)
+    with perfilar(args.perfil, args.arquivo_perfil) as perfil:
+        total_linhas = limpar_e_exportar(
+            args.entrada, args.saida, indice, args.formato, args.tamanho_bloco, cache, args.trabalhadores, relatorio,
+            instrumentacao, args.corrigir_aproximado, correcoes, deduplicacao
+        )
+    print(f"{total_linhas} linhas limpas gravadas em {os.path.abspath(args.saida)}")
+    print(f"Leitura: {relatorio.resumo()}")
+    print(f"Etapas:\n{instrumentacao.resumo()}")
+    if args.corrigir_aproximado is not None:
+        print(f"Correções aproximadas: {len(correcoes)} valores distintos corrigidos")
+        if len(correcoes):
+            print(correcoes.tabela().to_string(index=False))
+    if deduplicacao is not None:
+        print(f"Memória de leads ({deduplicacao.memoria.caminho}): {deduplicacao.resumo()}")
+    instrumentacao.emitir_logs(entrada=os.path.basename(args.entrada), trabalhadores=args.trabalhadores)
+    if perfil is not None:
+        print(perfil.texto)
+    if resolver_trabalhadores(args.trabalhadores) > 1:
+        return 0
+    estatisticas = cache.estatisticas()
+    print(f"Transformações por valor distinto: {estatisticas['valores_unicos']} de {estatisticas['linhas']} células "
+          f"({estatisticas['reaproveitamento']:.1%} reaproveitadas), acertos no cache: {estatisticas['taxa_acerto']:.1%}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
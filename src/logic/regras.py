@@ -0,0 +1,66 @@
+# Arquivo: src/logic/regras.py
+# Tabela declarativa de regras de normalização (sufixos de empresa, exceções de caixa, prefixos de URL),
+# lida de um JSON e compilada uma única vez por processo.
+import functools
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+
+CAMINHO_REGRAS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'regras_normalizacao.json'
+)
+# Permite trocar a tabela inteira (por exemplo, com sufixos extras) sem alterar o repositório.
+VARIAVEL_AMBIENTE_REGRAS = 'AGENTE_LDR_REGRAS'
+
+@dataclass(frozen=True)
+class RegrasNormalizacao:
+    versao: str
+    excecoes_minusculas_empresa: frozenset
+    caracteres_finais_url_removidos: str
+    prefixo_site: str
+    # Um padrão por sufixo, na ordem da tabela, e a união de todos numa única regex.
+    padroes_sufixos: tuple
+    regex_sufixos: re.Pattern
+    # Sufixo encostado em outro texto: a remoção poderia formar um novo sufixo (ex.: "X  LTDAME").
+    regex_sufixo_colado: re.Pattern
+    regex_prefixo_url: re.Pattern
+
+def _padrao_sufixo(regra):
+    if 'regex' in regra:
+        return regra['regex']
+    padrao = r'\s' + re.escape(regra['texto'])
+    if regra.get('ponto_opcional'):
+        padrao += r'\.?'
+    if regra.get('palavra_inteira'):
+        padrao += r'\b'
+    return padrao
+
+def compilar_regras(tabela):
+    """Compila a tabela (dict no formato de regras_normalizacao.json)."""
+    padroes = tuple(_padrao_sufixo(regra) for regra in tabela['sufixos_empresa'])
+    # Na alternância vale a primeira alternativa que casa: a ordem da tabela é a ordem de prioridade.
+    uniao = '|'.join(f'(?:{p})' for p in padroes)
+    prefixos = '|'.join(re.escape(p) for p in sorted(tabela['prefixos_url_removidos'], key=len, reverse=True))
+    versao = hashlib.sha256(json.dumps(tabela, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    return RegrasNormalizacao(
+        versao=versao,
+        excecoes_minusculas_empresa=frozenset(tabela['excecoes_minusculas_empresa']),
+        caracteres_finais_url_removidos=tabela['caracteres_finais_url_removidos'],
+        prefixo_site=tabela['prefixo_site'],
+        padroes_sufixos=tuple(re.compile(p, re.IGNORECASE) for p in padroes),
+        regex_sufixos=re.compile(uniao, re.IGNORECASE),
+        # O lookahead com grupo + referência fixa o mesmo trecho que o sub() removeria (sem backtracking).
+        regex_sufixo_colado=re.compile(f'(?=(?P<sufixo>{uniao}))(?P=sufixo)(?=\\S)', re.IGNORECASE),
+        regex_prefixo_url=re.compile(f'^(?:{prefixos})' if prefixos else r'^(?!)'),
+    )
+
+@functools.lru_cache(maxsize=4)
+def _carregar_regras(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        return compilar_regras(json.load(arquivo))
+
+def carregar_regras(caminho=None):
+    """Regras compiladas de `caminho`, da variável AGENTE_LDR_REGRAS ou do arquivo padrão do projeto."""
+    return _carregar_regras(caminho or os.environ.get(VARIAVEL_AMBIENTE_REGRAS) or CAMINHO_REGRAS)
@@ -0,0 +1,155 @@
+# Arquivo: src/logic/selecao.py
+# Seleção de um único contato por empresa, escolhido pela prioridade do cargo (Gerente > Coordenador > ...).
+import argparse
+import functools
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.logic.data_cleaning import aplicar_por_valores_unicos, normalizar_texto_para_comparacao
+from src.logic.exportacao import FORMATOS_EXPORTACAO, exportar
+from src.logic.ingestao import TIPO_TEXTO
+from src.logic.memoria_leads import dominios_dos_sites
+
+# Níveis (rótulo, padrão) em ordem de prioridade; os padrões casam com o cargo em minúsculas e sem acentos.
+CAMINHO_PRIORIDADES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'prioridade_cargos.json'
+)
+# Permite usar outra lista de cargos (ex.: por campanha) sem alterar o repositório.
+VARIAVEL_AMBIENTE_PRIORIDADES = 'AGENTE_LDR_PRIORIDADES'
+COLUNA_MOTIVO = 'Motivo_Selecao'
+
+@dataclass(frozen=True)
+class PrioridadeCargos:
+    rotulos: tuple
+    # Um grupo nomeado por nível (n0, n1, ...) numa única regex: uma passada por cargo distinto.
+    regex: re.Pattern
+
+    @property
+    def sem_prioridade(self):
+        return len(self.rotulos)
+
+    def prioridade(self, cargo):
+        """Índice do nível mais prioritário encontrado em `cargo` (0 = melhor), ou `sem_prioridade`."""
+        texto = normalizar_texto_para_comparacao(cargo)
+        return min((int(m.lastgroup[1:]) for m in self.regex.finditer(texto)), default=self.sem_prioridade)
+
+def compilar_prioridades(niveis):
+    """Compila a lista (rótulo, padrão), em ordem de prioridade, num único casador."""
+    niveis = tuple(niveis)
+    if not niveis:
+        raise ValueError("A lista de prioridade de cargos está vazia.")
+    uniao = '|'.join(f'(?P<n{i}>{padrao})' for i, (_, padrao) in enumerate(niveis))
+    return PrioridadeCargos(tuple(rotulo for rotulo, _ in niveis), re.compile(rf'\b(?:{uniao})\b'))
+
+@functools.lru_cache(maxsize=4)
+def _carregar_prioridades(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        return compilar_prioridades((nivel['rotulo'], nivel['padrao']) for nivel in json.load(arquivo)['niveis'])
+
+def carregar_prioridades(caminho=None):
+    """Prioridades compiladas de `caminho`, da variável AGENTE_LDR_PRIORIDADES ou do arquivo padrão do projeto."""
+    return _carregar_prioridades(caminho or os.environ.get(VARIAVEL_AMBIENTE_PRIORIDADES) or CAMINHO_PRIORIDADES)
+
+def normalizar_nomes_empresa(nomes):
+    """Nome da empresa em minúsculas, sem acentos e só com letras e dígitos separados por espaço ('' se vazio)."""
+    # Cada nome distinto é normalizado uma vez; com pyarrow, cada passo roda sobre a coluna inteira no Arrow.
+    codigos, unicos = pd.factorize(nomes.astype(object))
+    unicos = pd.Series(unicos, dtype=object).astype(TIPO_TEXTO).str.lower().str.normalize('NFD')
+    unicos = unicos.str.replace('[\u0300-\u036f]', '', regex=True).str.replace('[^a-z0-9]+', ' ', regex=True)
+    valores = np.append(unicos.str.strip().fillna('').to_numpy(dtype=object), '')
+    return pd.Series(valores[codigos], index=nomes.index, dtype=object)
+
+def chaves_empresa(df):
+    """Código inteiro por empresa: nome normalizado + domínio do site. -1 quando os dois estão vazios."""
+    vazia = pd.Series('', index=df.index, dtype=object)
+    nomes = normalizar_nomes_empresa(df['Nome_Empresa']) if 'Nome_Empresa' in df else vazia
+    dominios = dominios_dos_sites(df['Site_Original']).fillna('') if 'Site_Original' in df else vazia
+    chaves = nomes.astype(object) + '\x1f' + dominios.astype(object)
+    codigos, _ = pd.factorize(chaves)
+    codigos[((nomes == '') & (dominios == '')).to_numpy()] = -1
+    return codigos
+
+def _preenchido(df, coluna):
+    if coluna not in df:
+        return np.zeros(len(df), dtype=bool)
+    return (df[coluna].notna() & (df[coluna].astype(object) != '')).to_numpy()
+
+def _motivo(prioridades, nivel, contatos, empate, sem_empresa):
+    # Texto explicando a escolha; calculado uma vez por combinação distinta, não por linha.
+    if sem_empresa:
+        return 'Empresa não identificada (sem nome nem site)'
+    rotulo = prioridades.rotulos[nivel] if nivel < prioridades.sem_prioridade else None
+    if contatos == 1:
+        return f'Único contato da empresa; cargo {rotulo}' if rotulo else 'Único contato da empresa'
+    motivo = f'Cargo de maior prioridade ({rotulo})' if rotulo else 'Nenhum cargo da lista de prioridade'
+    motivo += f' entre {contatos} contatos da empresa'
+    if empate:
+        motivo += '; desempate por e-mail, telefone e ordem no arquivo'
+    return motivo
+
+def selecionar_um_por_empresa(df, prioridades=None):
+    """Um contato por empresa: o de cargo mais prioritário; empates vão para quem tem e-mail, depois telefone,
+    depois a ordem do arquivo. Leads sem empresa identificável ficam todos. Acrescenta a coluna Motivo_Selecao.
+    """
+    prioridades = prioridades or carregar_prioridades()
+    n = len(df)
+    empresas = chaves_empresa(df)
+    # Sem nome nem site não há como agrupar: cada lead vira a própria "empresa".
+    sem_empresa = empresas < 0
+    empresas[sem_empresa] = empresas.max(initial=-1) + 1 + np.arange(sem_empresa.sum())
+    if 'Cargo' in df:
+        nivel = aplicar_por_valores_unicos(prioridades.prioridade, df['Cargo']).to_numpy(dtype=np.int64)
+    else:
+        nivel = np.full(n, prioridades.sem_prioridade, dtype=np.int64)
+    sem_email, sem_telefone = ~_preenchido(df, 'Email_Lead'), ~_preenchido(df, 'Telefone_Original')
+
+    # lexsort é estável e ordena pela última chave primeiro: empresa, nível, e-mail, telefone, posição.
+    ordem = np.lexsort((np.arange(n), sem_telefone, sem_email, nivel, empresas))
+    empresas_ordenadas = empresas[ordem]
+    primeiro = np.ones(n, dtype=bool)
+    primeiro[1:] = empresas_ordenadas[1:] != empresas_ordenadas[:-1]
+    # Se o seguinte na ordem é da mesma empresa e do mesmo nível, a escolha veio do desempate.
+    nivel_ordenado = nivel[ordem]
+    empate = np.zeros(n, dtype=bool)
+    empate[:-1] = (empresas_ordenadas[1:] == empresas_ordenadas[:-1]) & (nivel_ordenado[1:] == nivel_ordenado[:-1])
+    posicoes = np.flatnonzero(primeiro)
+    reordenar = np.argsort(ordem[posicoes])
+    escolhidos, empatados = ordem[posicoes][reordenar], empate[posicoes][reordenar]
+
+    contatos = np.bincount(empresas)[empresas[escolhidos]]
+    motivo = aplicar_por_valores_unicos(
+        lambda nivel, contatos, empate, sem_empresa: _motivo(prioridades, nivel, contatos, empate, sem_empresa),
+        pd.Series(nivel[escolhidos]), pd.Series(contatos), pd.Series(empatados), pd.Series(sem_empresa[escolhidos])
+    )
+
+    selecionados = df.iloc[escolhidos].copy()
+    selecionados[COLUNA_MOTIVO] = motivo.to_numpy()
+    return selecionados
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mantém um único contato por empresa num CSV de leads já limpo.")
+    parser.add_argument('entrada', help="CSV limpo (separador ';'), como o gerado por src.logic.pipeline.")
+    parser.add_argument('saida', help="Arquivo de saída só com os contatos escolhidos.")
+    parser.add_argument('--formato', choices=list(FORMATOS_EXPORTACAO), default='csv',
+                        help="Formato do arquivo de saída (padrão: csv).")
+    parser.add_argument('--prioridades', metavar='JSON',
+                        help="Lista de prioridade de cargos no formato de src/data/prioridade_cargos.json "
+                             f"(padrão: variável {VARIAVEL_AMBIENTE_PRIORIDADES} ou o arquivo do projeto).")
+    args = parser.parse_args(argv)
+
+    prioridades = carregar_prioridades(args.prioridades)
+    df = pd.read_csv(args.entrada, sep=';', dtype=str, keep_default_na=False, encoding='utf-8-sig')
+    selecionados = selecionar_um_por_empresa(df, prioridades)
+    exportar(selecionados, args.saida, args.formato)
+    print(f"{len(selecionados)} contatos escolhidos de {len(df)} leads gravados em {os.path.abspath(args.saida)}")
+    print(selecionados[COLUNA_MOTIVO].str.split(' entre ').str[0].value_counts().to_string())
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
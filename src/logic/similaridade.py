@@ -0,0 +1,164 @@
+# Arquivo: src/logic/similaridade.py
+# Correção aproximada (erros de digitação) de cidades e segmentos com um índice invertido de trigramas.
+import difflib
+import functools
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.logic.data_cleaning import DICIONARIO_SEGMENTOS, aplicar_por_valores_unicos, normalizar_texto_para_comparacao
+
+LIMIAR_PADRAO = 0.85
+# Só os candidatos mais parecidos pelos trigramas passam pela comparação fina: o custo por busca é limitado.
+CANDIDATOS_POR_BUSCA = 8
+SIMILARIDADE_MINIMA_TRIGRAMAS = 0.3
+TAMANHO_MINIMO_CONSULTA = 4
+
+def trigramas(texto):
+    texto = f'  {texto} '
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+class IndiceSimilaridade:
+    """Índice invertido de trigramas sobre chaves já normalizadas, com grupos opcionais (ex.: UF) por chave."""
+
+    def __init__(self, chaves, grupos=None):
+        self.chaves = list(chaves)
+        self.grupos = [frozenset(g) for g in grupos] if grupos is not None else None
+        listas = defaultdict(list)
+        self._quantidade_trigramas = np.zeros(len(self.chaves), dtype=np.int32)
+        for i, chave in enumerate(self.chaves):
+            trigramas_chave = trigramas(chave)
+            self._quantidade_trigramas[i] = len(trigramas_chave)
+            for trigrama in trigramas_chave:
+                listas[trigrama].append(i)
+        self._indice = {t: np.array(ids, dtype=np.int32) for t, ids in listas.items()}
+
+    def __len__(self):
+        return len(self.chaves)
+
+    def _candidatos(self, consulta):
+        trigramas_consulta = trigramas(consulta)
+        listas = [self._indice[t] for t in trigramas_consulta if t in self._indice]
+        if not listas:
+            return []
+        comuns = np.bincount(np.concatenate(listas), minlength=len(self.chaves))
+        dice = 2 * comuns / (len(trigramas_consulta) + self._quantidade_trigramas)
+        quantidade = min(CANDIDATOS_POR_BUSCA, len(self.chaves))
+        melhores = np.argpartition(-dice, quantidade - 1)[:quantidade]
+        return [int(i) for i in melhores if dice[i] >= SIMILARIDADE_MINIMA_TRIGRAMAS]
+
+    def buscar(self, consulta, limiar=LIMIAR_PADRAO, grupo=None):
+        """Melhor chave para `consulta` como (chave, confiança), ou None abaixo do limiar.
+
+        Com `grupo`, chaves do mesmo grupo têm preferência; as demais só valem se nenhuma do grupo passar do limiar.
+        """
+        if len(consulta) < TAMANHO_MINIMO_CONSULTA or not self.chaves:
+            return None
+        pontuados = []
+        for i in self._candidatos(consulta):
+            confianca = difflib.SequenceMatcher(None, consulta, self.chaves[i]).ratio()
+            if confianca >= limiar:
+                no_grupo = grupo is not None and self.grupos is not None and grupo in self.grupos[i]
+                pontuados.append((no_grupo, confianca, self.chaves[i]))
+        if not pontuados:
+            return None
+        _, confianca, chave = max(pontuados)
+        return chave, confianca
+
+@dataclass
+class RelatorioCorrecoes:
+    # (coluna, valor original, valor corrigido) -> [confiança, ocorrências]
+    correcoes: dict = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.correcoes)
+
+    def registrar(self, coluna, original, corrigido, confianca, ocorrencias):
+        registro = self.correcoes.setdefault((coluna, original, corrigido), [confianca, 0])
+        registro[1] += ocorrencias
+
+    def mesclar(self, correcoes):
+        for (coluna, original, corrigido), (confianca, ocorrencias) in correcoes.items():
+            self.registrar(coluna, original, corrigido, confianca, ocorrencias)
+
+    def tabela(self):
+        linhas = [(*chave, confianca, ocorrencias) for chave, (confianca, ocorrencias) in self.correcoes.items()]
+        tabela = pd.DataFrame(linhas, columns=['coluna', 'valor_original', 'valor_corrigido', 'confianca', 'ocorrencias'])
+        return tabela.sort_values(['ocorrencias', 'confianca', 'coluna', 'valor_original'],
+                                  ascending=[False, False, True, True], ignore_index=True)
+
+# Índices de cidades por versão do índice do IBGE: montados uma vez por processo.
+_INDICES_CIDADES = {}
+
+def indice_cidades(indice):
+    chave = (indice.versao, indice.origem, len(indice.mapa_cidades))
+    if chave not in _INDICES_CIDADES:
+        ufs_por_cidade = defaultdict(set)
+        for cidade, sigla in indice.cidades_por_uf:
+            ufs_por_cidade[cidade].add(sigla)
+        chaves = list(indice.mapa_cidades)
+        _INDICES_CIDADES[chave] = IndiceSimilaridade(chaves, [ufs_por_cidade[c] for c in chaves])
+    return _INDICES_CIDADES[chave]
+
+def _normalizar_segmento(segmento):
+    # Mesma chave usada por padronizar_segmento para consultar DICIONARIO_SEGMENTOS.
+    return str(segmento).lower().strip().replace('&', 'and')
+
+@functools.lru_cache(maxsize=1)
+def indice_segmentos():
+    return IndiceSimilaridade(DICIONARIO_SEGMENTOS)
+
+def _corrigir_coluna(corrigir, colunas, nome_coluna, relatorio):
+    # `corrigir` devolve (valor corrigido, confiança) ou None; roda uma vez por valor distinto.
+    confiancas = {}
+
+    def aplicar(*valores):
+        correcao = corrigir(*valores)
+        if correcao is None:
+            return valores[0]
+        confiancas[(valores[0], correcao[0])] = correcao[1]
+        return correcao[0]
+
+    original = colunas[0]
+    corrigida = aplicar_por_valores_unicos(aplicar, *colunas)
+    alterados = original.notna().to_numpy() & (corrigida.to_numpy() != original.astype(object).to_numpy())
+    if relatorio is not None and alterados.any():
+        pares = pd.DataFrame({'original': original[alterados].astype(object), 'corrigido': corrigida[alterados]})
+        for par, ocorrencias in pares.value_counts(sort=False).items():
+            relatorio.registrar(nome_coluna, *par, confiancas[par], int(ocorrencias))
+    return corrigida.where(alterados, original)
+
+def corrigir_cidades(cidades, estados, indice, limiar=LIMIAR_PADRAO, relatorio=None, nome_coluna='Cidade'):
+    """Troca cidades fora do IBGE pelo município mais parecido (de preferência na UF da linha)."""
+    indice_similaridade = indice_cidades(indice)
+
+    def corrigir(cidade, estado):
+        if pd.isna(cidade):
+            return None
+        chave = normalizar_texto_para_comparacao(cidade)
+        if chave in indice.mapa_cidades:
+            return None
+        sigla = indice.sigla_uf(estado)
+        encontrado = indice_similaridade.buscar(chave, limiar, grupo=sigla)
+        if encontrado is None:
+            return None
+        chave_encontrada, confianca = encontrado
+        return indice.cidades_por_uf.get((chave_encontrada, sigla), indice.mapa_cidades[chave_encontrada]), confianca
+
+    return _corrigir_coluna(corrigir, [cidades, estados], nome_coluna, relatorio)
+
+def corrigir_segmentos(segmentos, limiar=LIMIAR_PADRAO, relatorio=None, nome_coluna='Segmento'):
+    """Troca segmentos fora de DICIONARIO_SEGMENTOS pela chave mais parecida do dicionário."""
+    indice_similaridade = indice_segmentos()
+
+    def corrigir(segmento):
+        if pd.isna(segmento):
+            return None
+        chave = _normalizar_segmento(segmento)
+        if chave in DICIONARIO_SEGMENTOS:
+            return None
+        return indice_similaridade.buscar(chave, limiar)
+
+    return _corrigir_coluna(corrigir, [segmentos], nome_coluna, relatorio)
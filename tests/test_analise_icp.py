@@ -0,0 +1,23 @@
+# Arquivo: tests/test_analise_icp.py
+import numpy as np
+import pandas as pd
+
+from src.logic.analise_icp import SEM_INFORMACAO, CuboICP, faixas_porte
+
+def test_faixas_do_apollo_entram_no_porte_pelo_limite_inferior():
+    valores = ['51-200', '10,001+', '1.001-5.000', '501-1,000', '11 - 50', '120', '7', '', None, np.nan, 'abc']
+    assert list(faixas_porte(pd.Series(valores, dtype=object))) == [
+        '51-200', '5001+', '1001-5000', '501-1000', '11-50', '51-200', '1-10',
+        SEM_INFORMACAO, SEM_INFORMACAO, SEM_INFORMACAO, SEM_INFORMACAO,
+    ]
+
+def test_filtro_de_porte_conta_arquivos_com_faixas():
+    df = pd.DataFrame({
+        'Email_Lead': ['a@x.com', 'b@y.com', 'c@z.com'],
+        'Nome_Empresa': ['X', 'Y', 'Z'],
+        'Numero_Funcionarios': pd.Categorical(['51-200', '120', '10,001+']),
+    })
+    cubo = CuboICP(df)
+    assert cubo.contar(porte=['51-200']).leads == 2
+    assert cubo.contar(porte=['5001+']).empresas == 1
+    assert cubo.contar(porte=[SEM_INFORMACAO]).linhas == 0
@@ -0,0 +1,51 @@
+# Arquivo: tests/test_data_cleaning.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.logic.data_cleaning import padronizar_telefone, padronizar_telefones
+
+TELEFONES = [
+    None, np.nan, pd.NA, '', '   ',
+    '+55 (11) 98765-4321', '+55 11 3456-7890', '+5511987654321', '55 11 98765 4321', '+1 415 555 0100',
+    '+351 21 123 4567', '(11) 98765-4321', '11 3456-7890', '(00) 98765-4321', '(20) 3456-7890',
+    '(99) 98765-4321', '1198765432', '11987654321', '011987654321', '01134567890', '(11) 8765-4321',
+    '(11) 6765-4321', '(11) 88765-4321', '0800 123 4567', '800 123 4567', '11 3456-7890 ramal 123',
+    '(11) 3456-7890 ext. 45', '11987654321 r.2', '123', 'sem telefone', '  (21) 2345-6789  ',
+]
+NAO_TEXTO = [11987654321, 1134567890, 5511987654321, 1198765432.0, 0, -11987654321, True]
+
+def _tipos_de_texto():
+    tipos = [object, pd.StringDtype()]
+    try:
+        import pyarrow  # noqa: F401
+        tipos.append(pd.StringDtype('pyarrow'))
+    except ImportError:
+        pass
+    return tipos
+
+@pytest.mark.parametrize('tipo', _tipos_de_texto(), ids=str)
+def test_padronizar_telefones_igual_a_versao_escalar(tipo):
+    serie = pd.Series(TELEFONES, dtype=tipo)
+    esperado = [padronizar_telefone(t) for t in serie]
+    assert padronizar_telefones(serie).tolist() == esperado
+
+def test_padronizar_telefones_com_valores_nao_texto():
+    serie = pd.Series(NAO_TEXTO + [None], dtype=object)
+    esperado = [padronizar_telefone(t) for t in serie]
+    assert padronizar_telefones(serie).tolist() == esperado
+
+def test_padronizar_telefones_numeros_aleatorios():
+    rng = np.random.default_rng(42)
+    prefixos = np.array(['', '+55 ', '55', '0', '+1 ', '(', '0800'])
+    numeros = [
+        f"{prefixo}{''.join(rng.choice(list('0123456789'), rng.integers(8, 13)))}"
+        for prefixo in rng.choice(prefixos, 5_000)
+    ]
+    for tipo in _tipos_de_texto():
+        serie = pd.Series(numeros, dtype=tipo)
+        assert padronizar_telefones(serie).tolist() == [padronizar_telefone(t) for t in serie]
+
+def test_padronizar_telefones_formata_celular_e_fixo():
+    resultado = padronizar_telefones(pd.Series(['+55 11 98765-4321', '11 3456-7890', '(00) 3456-7890']))
+    assert resultado.tolist() == ['(11) 98765-4321', '(11) 3456-7890', '']
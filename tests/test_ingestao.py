@@ -0,0 +1,58 @@
+# Arquivo: tests/test_ingestao.py
+import io
+
+import pandas as pd
+import pytest
+
+from src.logic.ingestao import RelatorioIngestao, detectar_formato, ler_csv, ler_csv_em_blocos
+from src.logic.pipeline import MAPA_COLUNAS
+
+def _ler_pelos_dois_caminhos(dados, tamanho_bloco=2):
+    relatorio_inteiro, relatorio_blocos = RelatorioIngestao(), RelatorioIngestao()
+    inteiro = ler_csv(io.BytesIO(dados), colunas=MAPA_COLUNAS, relatorio=relatorio_inteiro)
+    blocos = list(ler_csv_em_blocos(io.BytesIO(dados), tamanho_bloco, colunas=MAPA_COLUNAS, relatorio=relatorio_blocos))
+    em_blocos = pd.concat(blocos)
+    pd.testing.assert_frame_equal(inteiro.reset_index(drop=True), em_blocos.reset_index(drop=True))
+    return inteiro, relatorio_inteiro, relatorio_blocos
+
+def test_celulas_vazias_iguais_nos_dois_caminhos():
+    dados = (
+        "First Name,Last Name,Title,Corporate Phone,# Employees,City\n"
+        "Ana,,,00123,51,\n"
+        ",Silva,NA,11987654321,,São Paulo\n"
+        "\"Jo\nao\",\"\",Gerente,,10,Rio\n"
+        "Bia,Lima,,,,\n"
+    ).encode('utf-8')
+    df, _, _ = _ler_pelos_dois_caminhos(dados)
+    assert df['Corporate Phone'].tolist()[:2] == ['00123', '11987654321']
+    assert df['# Employees'].tolist()[0] == '51'
+    # Vazios chegam como ausentes, nunca como o texto 'None' ou 'nan'.
+    assert df['Last Name'].isna().tolist() == [True, False, True, False]
+    assert not df.isin(['None', 'nan', '<NA>']).any().any()
+
+def test_linhas_malformadas_contadas_nos_dois_caminhos():
+    dados = b"First Name,Last Name,City\nAna,Silva,Rio\nx,y,z,EXTRA\nBia,Lima\n"
+    df, relatorio_inteiro, relatorio_blocos = _ler_pelos_dois_caminhos(dados)
+    assert df['First Name'].tolist() == ['Ana', 'Bia']
+    assert relatorio_inteiro.linhas_descartadas == relatorio_blocos.linhas_descartadas == 1
+
+def test_codificacao_corrigida_depois_da_amostra():
+    # Os primeiros 64 KB são ASCII; o primeiro byte cp1252 só aparece depois da amostra.
+    dados = (b"First Name,Last Name,City\n" + b"Ana,Silva,Rio\n" * 7000
+             + "João,Lima,São Paulo\n".encode('cp1252') + b"Bia,Lima,Rio\n")
+    df, relatorio_inteiro, relatorio_blocos = _ler_pelos_dois_caminhos(dados, tamanho_bloco=1000)
+    assert len(df) == 7002
+    assert df.iloc[7000].tolist() == ['João', 'Lima', 'São Paulo']
+    assert relatorio_inteiro.codificacao == relatorio_blocos.codificacao == 'cp1252'
+    assert relatorio_blocos.linhas == 7002
+
+def test_separador_detectado_depois_do_preambulo():
+    dados = "Exported from Apollo\n\nFirst Name;Last Name;City\nAna;Silva, Jr;Rio\n".encode('utf-8')
+    formato = detectar_formato(io.BytesIO(dados), MAPA_COLUNAS)
+    assert (formato.separador, formato.linha_cabecalho) == (';', 2)
+    df, _, _ = _ler_pelos_dois_caminhos(dados)
+    assert df.to_dict('list') == {'First Name': ['Ana'], 'Last Name': ['Silva, Jr'], 'City': ['Rio']}
+
+def test_arquivo_sem_colunas_conhecidas():
+    with pytest.raises(ValueError, match='Nenhuma coluna esperada'):
+        ler_csv(io.BytesIO(b"foo,bar\n1,2\n"), colunas=MAPA_COLUNAS)
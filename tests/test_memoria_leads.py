@@ -0,0 +1,45 @@
+# Arquivo: tests/test_memoria_leads.py
+import io
+
+import pytest
+
+from src.logic.ibge import montar_indice
+from src.logic.memoria_leads import DeduplicacaoMemoria, MemoriaLeads
+from src.logic.pipeline import limpar_arquivo
+
+INDICE_VAZIO = montar_indice([], 'teste', 'teste')
+
+DADOS = (
+    "First Name,Last Name,Email,Corporate Phone\n"
+    "Ana,Silva,ana@x.com,11987654321\n"
+    "Bia,Lima,bia@x.com,\n"
+    "Ana,S.,ANA@x.com ,\n"
+    "Caio,Reis,caio@x.com,\n"
+    "Bia,L.,,11987654321\n"
+    "Davi,Sousa,davi@x.com,\n"
+).encode('utf-8')
+
+def _deduplicar(caminho_memoria, tamanho_bloco, registrar):
+    deduplicacao = DeduplicacaoMemoria(MemoriaLeads(str(caminho_memoria)), registrar=registrar)
+    df = limpar_arquivo(io.BytesIO(DADOS), INDICE_VAZIO, tamanho_bloco=tamanho_bloco, compactar=False,
+                        deduplicacao=deduplicacao)
+    return df['Email_Lead'].tolist(), deduplicacao
+
+@pytest.mark.parametrize('registrar', [False, True])
+@pytest.mark.parametrize('tamanho_bloco', [1, 2, 4])
+def test_repetidos_entre_blocos_iguais_ao_arquivo_inteiro(tmp_path, tamanho_bloco, registrar):
+    inteiro, dedup_inteiro = _deduplicar(tmp_path / 'inteiro.sqlite3', None, registrar)
+    em_blocos, dedup_blocos = _deduplicar(tmp_path / 'blocos.sqlite3', tamanho_bloco, registrar)
+    assert inteiro == em_blocos == ['ana@x.com', 'bia@x.com', 'caio@x.com', 'davi@x.com']
+    for dedup in (dedup_inteiro, dedup_blocos):
+        assert (dedup.conhecidos, dedup.repetidos_no_arquivo, dedup.novos) == (0, 2, 4)
+        assert dedup.guardados == (4 if registrar else 0)
+    assert len(dedup_blocos.memoria) == (4 if registrar else 0)
+
+@pytest.mark.parametrize('tamanho_bloco', [None, 2])
+def test_conhecidos_de_execucao_anterior_nao_viram_repetidos(tmp_path, tamanho_bloco):
+    caminho = tmp_path / 'memoria.sqlite3'
+    _deduplicar(caminho, None, registrar=True)
+    emails, dedup = _deduplicar(caminho, tamanho_bloco, registrar=True)
+    assert emails == []
+    assert (dedup.conhecidos, dedup.repetidos_no_arquivo, dedup.novos) == (6, 0, 0)